@@ -49,10 +49,27 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # After authentication: signed-in users are pinned to the primary by user
+    'shopify.middleware.ReplicaRoutingMiddleware',
+    # After authentication: the profiling header is honoured for staff only
+    'shopify.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'shopify.middleware.RequestRecorderMiddleware',
 ]
 
+# Request profiling (Server-Timing plus per-view histograms): requests sending
+# PROFILING_HEADER are always profiled, others with PROFILING_SAMPLE_RATE (0-1).
+# The header only works for staff users unless PROFILING_HEADER_PUBLIC is set
+# (e.g. on an internal load-test deployment).
+PROFILING_HEADER = config('PROFILING_HEADER', default='X-Profile')
+PROFILING_HEADER_PUBLIC = config('PROFILING_HEADER_PUBLIC', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_CACHE_ALIAS = 'default'
+
+# JSONL file that RequestRecorderMiddleware appends API traffic to (off when empty)
+REQUEST_RECORD_FILE = config('REQUEST_RECORD_FILE', default='')
+
 ROOT_URLCONF = 'Ecommerce.urls'
 
 TEMPLATES = [
@@ -76,6 +93,15 @@ WSGI_APPLICATION = 'Ecommerce.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection reuse: DB_POOL=True uses psycopg's connection pool (needs
+# psycopg[pool]; the right choice under ASGI), otherwise connections persist
+# for DB_CONN_MAX_AGE seconds per worker thread (0 closes them per request).
+# Persistent connections are WSGI only: async requests run their queries in
+# threads that are not reused, so their connections would never be used again.
+# SERVER_INTERFACE is set to asgi by Ecommerce/asgi.py.
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+SERVER_INTERFACE = config('SERVER_INTERFACE', default='wsgi')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -84,9 +110,91 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
+        # Pooled connections are returned to the pool instead of persisting
+        'CONN_MAX_AGE': 0 if DB_POOL or SERVER_INTERFACE == 'asgi' else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'OPTIONS': {
+            'pool': {
+                'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+                'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+                'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+            },
+        } if DB_POOL else {},
+    }
+}
+
+# Optional read replica: set DB_REPLICA_HOST (plus DB_REPLICA_NAME/PORT/USER/
+# PASSWORD where they differ from the primary). Safe reads of views marked
+# replica_reads go to DATABASE_REPLICAS; a client that writes keeps reading
+# from the primary for REPLICA_PIN_SECONDS (shopify/routers.py).
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': {**DATABASES['default']['OPTIONS']},
+        # Tests use the primary's test database through this alias
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['shopify.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+REPLICA_PIN_CACHE_ALIAS = 'default'
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'shopify.pagination.KeysetPagination',
+    'PAGE_SIZE': config('API_PAGE_SIZE', default=50, cast=int),
 }
 
+# orjson-backed JSON rendering/parsing (falls back to the stdlib when orjson is missing)
+if config('API_FAST_JSON', default=True, cast=bool):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'shopify.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'shopify.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
+# Threads (each with its own connection) for independent analytics queries; 1 runs them in turn
+ANALYTICS_QUERY_WORKERS = config('ANALYTICS_QUERY_WORKERS', default=3, cast=int)
+
+# Rows each day of the DailySales rollup is spread over; more shards mean less lock contention between checkouts
+ROLLUP_SHARDS = config('ROLLUP_SHARDS', default=8, cast=int)
+
+# Minutes a checkout may hold stock before unpaid reservations are released
+STOCK_RESERVATION_MINUTES = config('STOCK_RESERVATION_MINUTES', default=15, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='shopify'),
+    }
+}
+
+CATALOG_CACHE_ALIAS = 'default'
+CATALOG_CACHE_TIMEOUT = config('CATALOG_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds before the in-process product autocomplete index is rebuilt from the database
+AUTOCOMPLETE_REFRESH_SECONDS = config('AUTOCOMPLETE_REFRESH_SECONDS', default=300, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
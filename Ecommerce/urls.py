@@ -1,20 +1,37 @@
 from django.contrib import admin
 from django.urls import path, include
 from shopify import views
-from shopify.views import SalesAnalyticsView
+from shopify.views import SalesAnalyticsView, SalesSeriesView
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('customers/', views.CustomerListCreateView.as_view(), name='customer-list-create'),
     path('carts/', views.CartListCreateView.as_view(), name='cart-list-create'),
+    path('cart-items/', views.CartItemListCreateView.as_view(), name='cart-item-list-create'),
+    path('cart-items/<int:pk>/', views.CartItemDetailView.as_view(), name='cart-item-detail'),
     path('wishlists/', views.WishlistListCreateView.as_view(), name='wishlist-list-create'),    
     path('products/', views.ProductListCreateView.as_view(), name='product-list-create'),
+    path('products/search/', views.ProductSearchView.as_view(), name='product-search'),
+    path('products/autocomplete/', views.ProductAutocompleteView.as_view(), name='product-autocomplete'),
+    path('products/<int:pk>/', views.ProductDetailView.as_view(), name='product-detail'),
     path('categories/', views.CategoryListCreateView.as_view(), name='category-list-create'),
     path('orders/', views.OrderListCreateView.as_view(), name='order-list-create'),
     path('order-items/', views.OrderItemListCreateView.as_view(), name='order-item-list-create'),
+    path('orders/export/', views.OrderExportView.as_view(), name='order-export'),
+    path('order-items/export/', views.OrderItemExportView.as_view(), name='order-item-export'),
     path('payments/', views.PaymentListCreateView.as_view(), name='payment-list-create'),
     path('shipments/', views.ShipmentListCreateView.as_view(), name='shipment-list-create'),
+    path('checkout/', views.CheckoutView.as_view(), name='checkout'),
+    path('cache/catalog/stats/', views.CatalogCacheStatsView.as_view(), name='catalog-cache-stats'),
+    path('internal/profiling/', views.ProfilingStatsView.as_view(), name='profiling-stats'),
+    path('internal/db/', views.DatabasePoolStatsView.as_view(), name='db-pool-stats'),
     path('analytics/sales/', SalesAnalyticsView.as_view(), name='sales-analytics'),
+    path('analytics/sales/series/', SalesSeriesView.as_view(), name='sales-analytics-series'),
+    # Async (ASGI) variants of the read-heavy endpoints
+    path('async/products/', views.AsyncProductListView.as_view(), name='async-product-list'),
+    path('async/products/<int:pk>/', views.AsyncProductDetailView.as_view(), name='async-product-detail'),
+    path('async/categories/', views.AsyncCategoryListView.as_view(), name='async-category-list'),
+    path('async/analytics/sales/', views.AsyncSalesAnalyticsView.as_view(), name='async-sales-analytics'),
     
 ]
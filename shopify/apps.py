@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ShopifyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shopify'
+
+    def ready(self):
+        from . import dbpool, signals  # noqa: F401
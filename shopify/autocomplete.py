@@ -0,0 +1,157 @@
+import bisect
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(value):
+    return ' '.join((value or '').casefold().split())
+
+# In-process type-ahead over active products: a sorted list of (key, pk) pairs
+# searched with bisect. Keys are the SKU, the full name and every word-start
+# suffix of the name, so "pen" finds "Fountain pen".
+#
+# Each process builds its own index on its first search; concurrent first
+# searches wait for that single build. It is not built at import, so servers
+# that import the app before forking workers (gunicorn --preload) never hand a
+# held lock or a shared database connection to their workers. It is kept
+# current by the Product signals of this process; writes handled by other
+# worker processes are picked up by a rebuild every
+# AUTOCOMPLETE_REFRESH_SECONDS that runs in a background thread while the old
+# index keeps answering. Changes arriving during a build are replayed onto it.
+class PrefixIndex:
+    def __init__(self):
+        self._init_locks()
+        self.reset()
+        if hasattr(os, 'register_at_fork'):
+            # A forked child has none of the parent's threads: start over with
+            # fresh locks rather than inherit one held by a build in progress
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _init_locks(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _after_fork(self):
+        self._init_locks()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._keys = []
+            self._entries = {}
+            self._built_at = None
+            self._pending = None
+
+    def search(self, prefix, limit=10):
+        self._ensure_built()
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            keys, entries = self._keys, self._entries
+            results, seen = [], set()
+            position = bisect.bisect_left(keys, (prefix,))
+            while position < len(keys) and len(results) < limit:
+                key, pk = keys[position]
+                if not key.startswith(prefix):
+                    break
+                if pk not in seen:
+                    seen.add(pk)
+                    results.append({'id': pk, **entries[pk]})
+                position += 1
+        return results
+
+    def update(self, product):
+        with self._lock:
+            self._apply(product.pk, (product.name, product.sku) if product.is_active else None)
+
+    def update_many(self, products):
+        for product in products:
+            self.update(product)
+
+    def remove(self, pk):
+        with self._lock:
+            self._apply(pk, None)
+
+    def _apply(self, pk, entry):
+        # Called with _lock held; entry is (name, sku) or None to remove
+        if self._pending is not None:
+            self._pending.append((pk, entry))
+        if self._built_at is not None:
+            self._remove(pk)
+            if entry is not None:
+                self._add(pk, *entry)
+
+    def _ensure_built(self):
+        built_at = self._built_at
+        if built_at is None:
+            # Concurrent first searches wait for one build instead of each running their own
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild()
+        elif time.monotonic() - built_at >= settings.AUTOCOMPLETE_REFRESH_SECONDS:
+            if self._build_lock.acquire(blocking=False):
+                threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _rebuild_in_background(self):
+        # Entered with _build_lock held by the thread that started it
+        try:
+            self._rebuild()
+        except Exception:
+            logger.exception('Rebuilding the autocomplete index failed')
+        finally:
+            self._build_lock.release()
+            connection.close()
+
+    def _rebuild(self):
+        with self._lock:
+            self._pending = []
+        try:
+            rows = Product.objects.filter(is_active=True).values_list('pk', 'name', 'sku').iterator(chunk_size=5000)
+            keys, entries = [], {}
+            for pk, name, sku in rows:
+                entries[pk] = {'name': name, 'sku': sku}
+                keys.extend((key, pk) for key in self._keys_for(name, sku))
+            keys.sort()
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._keys, self._entries, self._built_at = keys, entries, time.monotonic()
+            for pk, entry in pending or ():
+                self._apply(pk, entry)
+
+    def _add(self, pk, name, sku):
+        self._entries[pk] = {'name': name, 'sku': sku}
+        for key in self._keys_for(name, sku):
+            bisect.insort(self._keys, (key, pk))
+
+    def _remove(self, pk):
+        entry = self._entries.pop(pk, None)
+        if entry is None:
+            return
+        for key in self._keys_for(entry['name'], entry['sku']):
+            position = bisect.bisect_left(self._keys, (key, pk))
+            if position < len(self._keys) and self._keys[position] == (key, pk):
+                del self._keys[position]
+
+    @staticmethod
+    def _keys_for(name, sku):
+        words = normalize(name).split(' ')
+        keys = {' '.join(words[start:]) for start in range(len(words))}
+        keys.add(normalize(sku))
+        keys.discard('')
+        return keys
+
+index = PrefixIndex()
@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from .models import Cart, CartItem, Product
+
+
+# Cart.total_amount is kept equal to sum(quantity * product.price) over the
+# cart's items. Every line write moves it by an F() delta computed in the
+# UPDATE itself (the price is a subquery), so concurrent writers to the same
+# cart never overwrite each other and no items or products are loaded.
+# Writes that bypass the model signals can still drift; reconcile() finds and
+# fixes those carts.
+ZERO = Value(Decimal('0'), output_field=DecimalField(max_digits=10, decimal_places=2))
+
+
+def line_snapshot(item):
+    return {'cart_id': item.cart_id, 'product_id': item.product_id, 'quantity': item.quantity}
+
+def stored_line_snapshot(pk):
+    return CartItem.objects.filter(pk=pk).values('cart_id', 'product_id', 'quantity').first()
+
+def add_line(snapshot, sign=1):
+    price = Subquery(Product.objects.filter(pk=snapshot['product_id']).values('price')[:1])
+    Cart.objects.filter(pk=snapshot['cart_id']).update(
+        total_amount=F('total_amount') + Coalesce(price, ZERO) * (sign * snapshot['quantity']),
+        updated_at=now(),
+    )
+
+def remove_line(snapshot):
+    add_line(snapshot, sign=-1)
+
+def reprice(changes):
+    # changes maps product id -> price delta; every cart holding one of them
+    # moves by sum(quantity * delta) in a single UPDATE
+    changes = {pk: delta for pk, delta in changes.items() if delta}
+    if not changes:
+        return 0
+    delta = Case(
+        *[When(product_id=pk, then=Value(amount)) for pk, amount in changes.items()],
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+    moved = Subquery(
+        CartItem.objects.filter(cart=OuterRef('pk'), product_id__in=changes)
+        .order_by().values('cart').annotate(amount=Sum(F('quantity') * delta)).values('amount')
+    )
+    return Cart.objects.filter(pk__in=CartItem.objects.filter(product_id__in=changes).values('cart')).update(
+        total_amount=F('total_amount') + moved,
+        updated_at=now(),
+    )
+
+def expected_totals():
+    return Cart.objects.order_by().annotate(
+        expected=Coalesce(Sum(F('items__quantity') * F('items__product__price')), ZERO),
+    )
+
+def find_drift():
+    # One aggregate query over all carts; only the drifted ones come back
+    return list(
+        expected_totals().exclude(total_amount=F('expected'))
+        .values_list('pk', 'total_amount', 'expected')
+    )
+
+@transaction.atomic
+def reconcile(fix=True):
+    drifted = find_drift()
+    if fix and drifted:
+        total = Subquery(
+            CartItem.objects.filter(cart=OuterRef('pk')).order_by().values('cart')
+            .annotate(total=Sum(F('quantity') * F('product__price'))).values('total')
+        )
+        Cart.objects.filter(pk__in=[pk for pk, _, _ in drifted]).update(
+            total_amount=Coalesce(total, ZERO), updated_at=now()
+        )
+    return drifted
@@ -0,0 +1,76 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+# Catalog responses are cached under keys that embed a version per namespace
+# ("products", "product:<pk>", "categories", ...). A write bumps the versions
+# it affects, so stale entries are never read again and simply age out.
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+def _version_key(namespace):
+    return f'catalog:version:{namespace}'
+
+def versions(namespaces):
+    cache = get_cache()
+    keys = [_version_key(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # A fresh timestamp never collides with versions issued before eviction
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+def bump(*namespaces):
+    # Deferred to commit so a concurrent read cannot re-cache pre-commit rows
+    transaction.on_commit(lambda: _bump(namespaces))
+
+def _bump(namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+def build_key(namespaces, path):
+    tags = '.'.join(f'{namespace}={version}' for namespace, version in zip(namespaces, versions(namespaces)))
+    # Hashed so long query strings (e.g. ?ids=...) stay within memcached's key limit
+    return f'catalog:response:{tags}:{hashlib.md5(path.encode()).hexdigest()}'
+
+def invalidate_products(pks=()):
+    bump('products', *[f'product:{pk}' for pk in pks])
+
+def invalidate_categories():
+    bump('categories')
+
+def invalidate_catalog():
+    # Deleting a category nulls product.category with a plain UPDATE
+    bump('products', 'product-catalog', 'categories')
+
+def record(outcome):
+    cache = get_cache()
+    key = f'catalog:stats:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+def stats():
+    cache = get_cache()
+    counts = cache.get_many(['catalog:stats:hit', 'catalog:stats:miss'])
+    hits = counts.get('catalog:stats:hit', 0)
+    misses = counts.get('catalog:stats:miss', 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
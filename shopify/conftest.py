@@ -0,0 +1,100 @@
+import os
+import time
+from contextlib import contextmanager
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+from shopify import autocomplete
+
+
+# Per-endpoint performance budgets, keyed by URL name: the most queries a GET
+# may run (whatever the number of rows) and its wall time in milliseconds.
+# BUDGET_TIME_SCALE stretches the time budgets on slow machines.
+ENDPOINT_BUDGETS = {
+    'customer-list-create': {'queries': 2, 'ms': 500},
+    'cart-list-create': {'queries': 2, 'ms': 500},
+    'cart-item-list-create': {'queries': 1, 'ms': 500},
+    'wishlist-list-create': {'queries': 2, 'ms': 500},
+    'product-list-create': {'queries': 2, 'ms': 500},
+    'product-detail': {'queries': 2, 'ms': 500},
+    'category-list-create': {'queries': 1, 'ms': 500},
+    'order-list-create': {'queries': 4, 'ms': 500},
+    'order-item-list-create': {'queries': 1, 'ms': 500},
+    'payment-list-create': {'queries': 2, 'ms': 500},
+    'shipment-list-create': {'queries': 2, 'ms': 500},
+    'sales-analytics': {'queries': 3, 'ms': 500},
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached catalog responses and the in-process autocomplete index would
+    # otherwise outlive each test's rolled-back rows
+    cache.clear()
+    autocomplete.index.reset()
+
+@pytest.fixture
+def staff_client(db):
+    # For the internal endpoints (IsAdminUser) and the profiling header
+    client = Client()
+    client.force_login(get_user_model().objects.create_user('staff', is_staff=True))
+    return client
+
+# Test client that measures every request and fails the test, listing the SQL,
+# when the endpoint's budget is exceeded. budget() overrides the declared
+# budget for the requests made inside it.
+class BudgetClient(Client):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.override = None
+        self.measurements = []
+
+    @contextmanager
+    def budget(self, queries=None, ms=None):
+        previous, self.override = self.override, {'queries': queries, 'ms': ms}
+        try:
+            yield
+        finally:
+            self.override = previous
+
+    def request(self, **request):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = super().request(**request)
+            elapsed = (time.perf_counter() - started) * 1000
+        name = self.url_name(request['PATH_INFO'])
+        sql = [query['sql'] for query in context.captured_queries]
+        self.measurements.append({'url_name': name, 'queries': len(sql), 'ms': elapsed})
+        self.check(request['REQUEST_METHOD'], request['PATH_INFO'], name, sql, elapsed)
+        return response
+
+    def check(self, method, path, name, sql, elapsed):
+        budget = self.override or (ENDPOINT_BUDGETS.get(name) if method == 'GET' else None)
+        if budget is None:
+            return
+        if budget['queries'] is not None and len(sql) > budget['queries']:
+            listing = '\n'.join(f'  {number}. {statement}' for number, statement in enumerate(sql, 1))
+            pytest.fail(
+                f"{method} {path} ({name}) ran {len(sql)} queries, budget is {budget['queries']}:\n{listing}",
+                pytrace=False,
+            )
+        limit = budget['ms'] and budget['ms'] * float(os.environ.get('BUDGET_TIME_SCALE', 1))
+        if limit and elapsed > limit:
+            pytest.fail(f"{method} {path} ({name}) took {elapsed:.0f} ms, budget is {limit:.0f} ms", pytrace=False)
+
+    @staticmethod
+    def url_name(path):
+        try:
+            return resolve(path).url_name
+        except Resolver404:
+            return None
+
+@pytest.fixture
+def budget_client():
+    return BudgetClient()
@@ -0,0 +1,35 @@
+import threading
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# Connections opened by this process per alias. Without reuse this grows with
+# every request; with persistent connections it should stay near the number of
+# worker threads. Under pooling each pool checkout counts, so the pool's own
+# figures (connections_num, pool_size) show the physical connections instead.
+_connects = {}
+_lock = threading.Lock()
+
+@receiver(connection_created)
+def count_connect(sender, connection, **kwargs):
+    with _lock:
+        _connects[connection.alias] = _connects.get(connection.alias, 0) + 1
+
+def stats():
+    results = {}
+    for alias in connections:
+        connection = connections[alias]
+        # Only the PostgreSQL backend has a pool, and only with OPTIONS['pool']
+        pool = getattr(connection, 'pool', None)
+        results[alias] = {
+            'vendor': connection.vendor,
+            'pooled': pool is not None,
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            'connects': _connects.get(alias, 0),
+        }
+        if pool is not None:
+            results[alias]['pool'] = pool.get_stats()
+    return results
@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils.timezone import now, timedelta
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from . import catalog_cache
+from .models import Order, Product, StockReservation
+
+
+class InsufficientStock(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Not enough stock to reserve the requested quantities.'
+    default_code = 'insufficient_stock'
+
+    def __init__(self, product_ids):
+        self.product_ids = product_ids
+        super().__init__({'stock': self.default_detail, 'products': product_ids})
+
+class ReservationExpired(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The stock held for this order was released; place the order again.'
+    default_code = 'reservation_expired'
+
+class _Shortfall(Exception):
+    pass
+
+
+# Stock moves with a single conditional UPDATE per batch:
+#   UPDATE product SET stock = stock - CASE id ... END
+#   WHERE id IN (...) AND stock >= CASE id ... END
+# Rows are only touched when every line fits, so concurrent checkouts never
+# oversell and nobody holds a row lock across a read-modify-write.
+@transaction.atomic
+def reserve_stock(order, lines, ttl=None):
+    quantities = _sum_quantities(lines)
+    if not quantities:
+        return []
+
+    amount = _per_product(quantities)
+    try:
+        with transaction.atomic():
+            updated = Product.objects.filter(pk__in=quantities, stock__gte=amount).update(
+                stock=F('stock') - amount, updated_at=now()
+            )
+            if updated != len(quantities):
+                raise _Shortfall
+    except _Shortfall:
+        available = dict(Product.objects.filter(pk__in=quantities).values_list('pk', 'stock'))
+        raise InsufficientStock(sorted(pk for pk, quantity in quantities.items() if available.get(pk, 0) < quantity))
+    catalog_cache.invalidate_products(quantities)
+
+    if ttl is None:
+        ttl = timedelta(minutes=settings.STOCK_RESERVATION_MINUTES)
+    expires_at = now() + ttl
+    return StockReservation.objects.bulk_create(
+        StockReservation(order_id=order.pk, product_id=pk, quantity=quantity, expires_at=expires_at)
+        for pk, quantity in quantities.items()
+    )
+
+# Gives back part of an order's held stock when its items shrink or go away:
+# reservations of each product are reduced (newest first) or released whole.
+@transaction.atomic
+def release_quantities(order_id, lines):
+    remaining = _sum_quantities(lines)
+    rows = list(
+        StockReservation.objects.filter(
+            order_id=order_id, product_id__in=remaining, status=StockReservation.RESERVED
+        ).select_for_update().order_by('-expires_at', '-pk').values_list('pk', 'product_id', 'quantity')
+    )
+    released, whole = {}, []
+    for pk, product_id, quantity in rows:
+        taken = min(quantity, remaining[product_id])
+        if not taken:
+            continue
+        remaining[product_id] -= taken
+        released[product_id] = released.get(product_id, 0) + taken
+        if taken == quantity:
+            whole.append(pk)
+        else:
+            StockReservation.objects.filter(pk=pk).update(quantity=F('quantity') - taken, updated_at=now())
+    if not released:
+        return 0
+    StockReservation.objects.filter(pk__in=whole).update(status=StockReservation.RELEASED, updated_at=now())
+    Product.objects.filter(pk__in=released).update(stock=F('stock') + _per_product(released), updated_at=now())
+    catalog_cache.invalidate_products(released)
+    return sum(released.values())
+
+def release_reservations(order):
+    return _release(StockReservation.objects.filter(order_id=order.pk))
+
+def release_expired_reservations():
+    return _release(StockReservation.objects.filter(expires_at__lte=now()), expire_orders=True)
+
+# Paying commits the order's reservations. Once they were released the stock
+# may already be sold to someone else, so the payment is refused instead.
+# The UPDATE waits on a concurrent _release holding the rows and then sees
+# them RELEASED.
+@transaction.atomic
+def commit_reservations(order):
+    committed = StockReservation.objects.filter(
+        order_id=order.pk, status=StockReservation.RESERVED
+    ).update(status=StockReservation.COMMITTED, updated_at=now())
+    if not committed and StockReservation.objects.filter(order_id=order.pk, status=StockReservation.RELEASED).exists():
+        raise ReservationExpired
+    return committed
+
+@transaction.atomic
+def _release(reservations, expire_orders=False):
+    # Locking the reservation rows first means a cancel racing the expiry
+    # sweeper cannot return the same stock twice.
+    rows = list(
+        reservations.filter(status=StockReservation.RESERVED)
+        .select_for_update()
+        .values_list('pk', 'product_id', 'quantity')
+    )
+    if not rows:
+        return 0
+    StockReservation.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(
+        status=StockReservation.RELEASED, updated_at=now()
+    )
+    quantities = _sum_quantities((product_id, quantity) for _, product_id, quantity in rows)
+    Product.objects.filter(pk__in=quantities).update(stock=F('stock') + _per_product(quantities), updated_at=now())
+    catalog_cache.invalidate_products(quantities)
+    if expire_orders:
+        # Unpaid orders whose stock went back can no longer be fulfilled
+        order_ids = StockReservation.objects.filter(pk__in=[pk for pk, _, _ in rows]).values('order_id')
+        Order.objects.filter(pk__in=order_ids, status='Pending').update(status='Expired', updated_at=now())
+    return len(rows)
+
+def _sum_quantities(lines):
+    quantities = {}
+    for product_id, quantity in lines:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    return quantities
+
+def _per_product(quantities):
+    return Case(
+        *[When(pk=pk, then=Value(quantity)) for pk, quantity in quantities.items()],
+        output_field=IntegerField(),
+    )
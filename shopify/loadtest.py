@@ -0,0 +1,157 @@
+import base64
+import json
+import math
+import queue
+import threading
+import time
+from urllib import error, request as urllib_request
+
+from django.db import connection, connections
+from django.test import Client
+from django.urls import Resolver404, resolve
+
+
+# Replays requests recorded by RequestRecorderMiddleware (one JSON object per
+# line with method/path/body) and reports latency and query counts per URL name.
+def load_entries(path):
+    entries, skipped = [], 0
+    with open(path, encoding='utf-8') as lines:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if not isinstance(entry, dict) or 'method' not in entry or 'path' not in entry:
+                skipped += 1
+                continue
+            entries.append(entry)
+    return entries, skipped
+
+def entry_body(entry):
+    body = entry.get('body')
+    if body is None:
+        return b''
+    if entry.get('body_encoding') == 'base64':
+        return base64.b64decode(body)
+    return body.encode()
+
+def url_name(path):
+    try:
+        match = resolve(path.split('?', 1)[0])
+    except Resolver404:
+        return '<unresolved>'
+    return match.url_name or match.view_name
+
+# In-process target: the Django test client against the configured database.
+# Query counts come from an execute_wrapper on the worker thread's connection.
+class ClientTarget:
+    counts_queries = True
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def send(self, entry):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client(raise_request_exception=False)
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            response = client.generic(
+                entry['method'], entry['path'], entry_body(entry),
+                content_type=entry.get('content_type') or 'application/octet-stream',
+            )
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response.status_code, len(queries)
+
+    def close(self):
+        connections.close_all()
+
+class LiveTarget:
+    counts_queries = False
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def send(self, entry):
+        body = entry_body(entry)
+        req = urllib_request.Request(self.base_url + entry['path'], data=body or None, method=entry['method'])
+        if body and entry.get('content_type'):
+            req.add_header('Content-Type', entry['content_type'])
+        try:
+            with urllib_request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+                return response.status, None
+        except error.HTTPError as exc:
+            return exc.code, None
+        except OSError:
+            return 0, None
+
+    def close(self):
+        pass
+
+def replay(entries, target, concurrency=1, repeat=1):
+    # Each worker pulls the next request from a shared queue, so the recorded
+    # order is kept within each pass but requests overlap across workers.
+    pending = queue.Queue()
+    for _ in range(repeat):
+        for entry in entries:
+            pending.put(entry)
+    results, lock = [], threading.Lock()
+
+    def work():
+        try:
+            while True:
+                try:
+                    entry = pending.get_nowait()
+                except queue.Empty:
+                    return
+                started = time.perf_counter()
+                status, queries = target.send(entry)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    results.append((url_name(entry['path']), status, elapsed, queries))
+        finally:
+            target.close()
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=work) for _ in range(max(concurrency, 1))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results, time.perf_counter() - started
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a sorted list
+    if not values:
+        return None
+    return values[max(math.ceil(fraction * len(values)) - 1, 0)]
+
+def summarize(results, elapsed):
+    groups = {}
+    for name, status, seconds, queries in results:
+        groups.setdefault(name, []).append((status, seconds, queries))
+    groups['<all>'] = [(status, seconds, queries) for _, status, seconds, queries in results]
+
+    rows = []
+    for name, samples in groups.items():
+        durations = sorted(seconds for _, seconds, _ in samples)
+        counted = [queries for _, _, queries in samples if queries is not None]
+        rows.append({
+            'url_name': name,
+            'requests': len(samples),
+            'errors': sum(1 for status, _, _ in samples if not 200 <= status < 400),
+            'p50_ms': percentile(durations, 0.50) * 1000,
+            'p95_ms': percentile(durations, 0.95) * 1000,
+            'p99_ms': percentile(durations, 0.99) * 1000,
+            'rps': len(samples) / elapsed if elapsed else None,
+            'avg_queries': sum(counted) / len(counted) if counted else None,
+            'max_queries': max(counted) if counted else None,
+        })
+    rows.sort(key=lambda row: (row['url_name'] == '<all>', -row['requests'], row['url_name']))
+    return rows
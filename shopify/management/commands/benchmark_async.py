@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient
+from django.urls import reverse
+
+from shopify.loadtest import ClientTarget, LiveTarget, percentile, replay
+
+# Sync endpoint and its async twin
+ENDPOINTS = (
+    ('product-list-create', 'async-product-list'),
+    ('category-list-create', 'async-category-list'),
+    ('sales-analytics', 'async-sales-analytics'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput of the sync read endpoints with their async (ASGI) variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--wsgi', help='Base URL of a WSGI server, e.g. gunicorn Ecommerce.wsgi --threads 4')
+        parser.add_argument('--asgi', help='Base URL of an ASGI server, e.g. uvicorn Ecommerce.asgi:application')
+
+    def handle(self, *args, **options):
+        count, concurrency = options['requests'], options['concurrency']
+        if bool(options['wsgi']) != bool(options['asgi']):
+            self.stderr.write('Give both --wsgi and --asgi to compare live servers; using the in-process clients')
+        live = options['wsgi'] and options['asgi']
+        self.stdout.write(f"{'endpoint':<24}{'mode':<7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+        for sync_name, async_name in ENDPOINTS:
+            sync_entries = [{'method': 'GET', 'path': reverse(sync_name)}]
+            async_entries = [{'method': 'GET', 'path': reverse(async_name)}]
+            if live:
+                sync_result = self.run_threads(sync_entries, LiveTarget(options['wsgi']), count, concurrency)
+                async_result = self.run_threads(async_entries, LiveTarget(options['asgi']), count, concurrency)
+            else:
+                sync_result = self.run_threads(sync_entries, ClientTarget(), count, concurrency)
+                async_result = async_to_sync(self.run_async)(async_entries[0]['path'], count, concurrency)
+            self.report(sync_name, 'sync', *sync_result)
+            self.report(sync_name, 'async', *async_result)
+
+    @staticmethod
+    def run_threads(entries, target, count, concurrency):
+        results, elapsed = replay(entries, target, concurrency=concurrency, repeat=count)
+        return [seconds for _, _, seconds, _ in results], [status for _, status, _, _ in results], elapsed
+
+    @staticmethod
+    async def run_async(path, count, concurrency):
+        client, limit = AsyncClient(), asyncio.Semaphore(concurrency)
+        durations, statuses = [], []
+
+        async def one():
+            async with limit:
+                started = time.perf_counter()
+                response = await client.get(path)
+                durations.append(time.perf_counter() - started)
+                statuses.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(count)))
+        return durations, statuses, time.perf_counter() - started
+
+    def report(self, name, mode, durations, statuses, elapsed):
+        durations = sorted(durations)
+        errors = sum(1 for status in statuses if not 200 <= status < 400)
+        self.stdout.write(
+            f"{name:<24}{mode:<7}{len(durations) / elapsed:>9.1f}{percentile(durations, 0.5) * 1000:>9.1f}"
+            f"{percentile(durations, 0.95) * 1000:>9.1f}{errors:>8}"
+        )
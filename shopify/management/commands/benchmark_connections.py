@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.urls import reverse
+
+from shopify import dbpool
+from shopify.loadtest import ClientTarget, percentile, replay
+
+# Environment for each connection mode; settings.py reads these at import, so
+# every mode runs in a fresh process
+MODES = {
+    'per-request': {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '60'},
+    'pooled': {'DB_POOL': 'True'},
+}
+
+
+# The test client leaves connections open between requests; closing them at the
+# same points as the WSGI/ASGI handlers makes CONN_MAX_AGE and the pool apply.
+class RequestCycleTarget(ClientTarget):
+    def send(self, entry):
+        close_old_connections()
+        try:
+            return super().send(entry)
+        finally:
+            close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request latency without connection reuse, with persistent connections and with pooling'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--path', help='Path to request (default: the customer list, one row per page)')
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+        parser.add_argument('--child', action='store_true', help='Run one mode in this process and print JSON')
+
+    def handle(self, *args, **options):
+        path = options['path'] or f"{reverse('customer-list-create')}?page_size=1"
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(path, options['requests'], options['concurrency'])))
+            return
+
+        self.stdout.write(f"{'mode':<13}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'connects':>10}{'errors':>8}")
+        for mode in options['modes']:
+            result = self.run_mode(mode, path, options)
+            self.stdout.write(
+                f"{mode:<13}{result['rps']:>9.1f}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+                f"{result['connects']:>10}{result['errors']:>8}"
+            )
+
+    def run_mode(self, mode, path, options):
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_connections', '--child',
+            '--requests', str(options['requests']), '--concurrency', str(options['concurrency']), '--path', path,
+        ]
+        if options.get('settings'):
+            command.append(f"--settings={options['settings']}")
+        child = subprocess.run(command, env={**os.environ, **MODES[mode]}, capture_output=True, text=True)
+        if child.returncode:
+            raise CommandError(f'{mode} run failed:\n{child.stderr.strip()}')
+        return json.loads(child.stdout.strip().splitlines()[-1])
+
+    @staticmethod
+    def measure(path, count, concurrency):
+        before = dbpool.stats()['default']['connects']
+        results, elapsed = replay([{'method': 'GET', 'path': path}], RequestCycleTarget(), concurrency=concurrency, repeat=count)
+        durations = sorted(seconds for _, _, seconds, _ in results)
+        return {
+            'rps': len(durations) / elapsed,
+            'p50_ms': percentile(durations, 0.50) * 1000,
+            'p95_ms': percentile(durations, 0.95) * 1000,
+            'connects': dbpool.stats()['default']['connects'] - before,
+            'errors': sum(1 for _, status, _, _ in results if not 200 <= status < 400),
+        }
@@ -0,0 +1,138 @@
+import os
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from shopify.models import Category, Customer, Order, Product
+
+
+# Indexes added for the hot lookups (migration 0009), by model; each query below reads one of them
+INDEXES = {
+    Order: ('order_customer_created_idx', 'order_status_created_idx'),
+    Product: ('product_active_category_idx',),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Seed a large dataset, then compare query plans and timings with and without the lookup indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=2000)
+        parser.add_argument('--orders', type=int, default=50000)
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--plans', action='store_true', help='Print the EXPLAIN output of every query')
+        parser.add_argument(
+            '--i-know', action='store_true',
+            help='Run against a database that is not a test/scratch database (DROP INDEX locks the tables until rollback)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['i_know'] and not self.is_scratch_database():
+            raise CommandError(
+                f"Refusing to drop indexes on {connection.settings_dict['NAME']!r}: use a database whose name "
+                "starts with test or scratch, or pass --i-know"
+            )
+        # Everything, seeded rows and dropped indexes included, is rolled back
+        try:
+            with transaction.atomic():
+                sample = self.seed(options['customers'], options['orders'], options['products'])
+                self.analyze()
+                queries = self.queries(sample)
+                with_indexes = self.measure(queries, options['repeat'])
+                self.drop_indexes()
+                self.analyze()
+                without_indexes = self.measure(queries, options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(f"{'query':<32}{'without ms':>12}{'with ms':>12}")
+        for name in queries:
+            before, after = without_indexes[name], with_indexes[name]
+            self.stdout.write(f"{name:<32}{before['ms']:>12.2f}{after['ms']:>12.2f}")
+            if options['plans']:
+                self.stdout.write(f"  without:\n{self.indent(before['plan'])}\n  with:\n{self.indent(after['plan'])}")
+
+    def seed(self, customers, orders, products):
+        self.stdout.write(f"Seeding {customers} customers, {products} products, {orders} orders ...")
+        categories = Category.objects.bulk_create(
+            Category(name=f'Benchmark {uuid.uuid4()}', slug=str(uuid.uuid4())) for _ in range(20)
+        )
+        customer_rows = Customer.objects.bulk_create(
+            (Customer(name='Benchmark', email=f'benchmark_{uuid.uuid4()}@example.com') for _ in range(customers)),
+            batch_size=1000,
+        )
+        product_rows = Product.objects.bulk_create(
+            (
+                Product(name=f'Benchmark {i}', description='Benchmark', price='9.99', stock=100,
+                        sku=str(uuid.uuid4()), category=random.choice(categories), is_active=i % 5 != 0)
+                for i in range(products)
+            ),
+            batch_size=1000,
+        )
+        started = now() - timedelta(days=365)
+        order_rows = Order.objects.bulk_create(
+            (
+                Order(customer=random.choice(customer_rows), total_amount='19.98',
+                      status=random.choice(('Pending', 'Shipped', 'Delivered', 'Cancelled')))
+                for _ in range(orders)
+            ),
+            batch_size=1000,
+        )
+        # auto_now_add ignores values given to bulk_create, so spread the dates afterwards
+        for order in order_rows:
+            order.created_at = started + timedelta(minutes=random.randrange(365 * 24 * 60))
+        Order.objects.bulk_update(order_rows, ['created_at'], batch_size=1000)
+        for product in product_rows:
+            product.created_at = started + timedelta(minutes=random.randrange(365 * 24 * 60))
+        Product.objects.bulk_update(product_rows, ['created_at'], batch_size=1000)
+        return {'customer': customer_rows[0].pk, 'category': categories[0].pk, 'since': now() - timedelta(days=30)}
+
+    def queries(self, sample):
+        return {
+            'orders of a customer': Order.objects.filter(customer_id=sample['customer']).order_by('-created_at', '-uuid')[:50],
+            'orders by status and date': Order.objects.filter(status='Shipped', created_at__gte=sample['since']).order_by('created_at'),
+            'active products in a category': Product.objects.filter(category_id=sample['category'], is_active=True).order_by('-created_at', '-id')[:50],
+        }
+
+    def measure(self, queries, repeat):
+        results = {}
+        for name, queryset in queries.items():
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = {'ms': best * 1000, 'plan': queryset.explain()}
+        return results
+
+    @staticmethod
+    def is_scratch_database():
+        name = os.path.basename(str(connection.settings_dict['NAME'])).lower()
+        return name.startswith(('test', 'scratch'))
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for names in INDEXES.values():
+                for name in names:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+
+    def analyze(self):
+        # Fresh planner statistics for the seeded rows
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    @staticmethod
+    def indent(plan):
+        return '\n'.join(f'    {line}' for line in plan.splitlines())
@@ -0,0 +1,86 @@
+import io
+import timeit
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from shopify.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+def order_page(orders, items_per_order):
+    # Shaped like OrderSerializer output: Decimals already coerced to strings,
+    # but related UUID primary keys and analytics values left as objects.
+    created = now()
+    page = []
+    for i in range(orders):
+        order_uuid = uuid.uuid4()
+        page.append({
+            'uuid': str(order_uuid),
+            'customer': i % 97,
+            'items': [
+                {
+                    'id': str(uuid.uuid4()),
+                    'order': order_uuid,
+                    'product': j,
+                    'quantity': j + 1,
+                    'unit_price': f'{j + 0.99:.2f}',
+                }
+                for j in range(items_per_order)
+            ],
+            'payments': [i],
+            'shipments': [],
+            'created_at': (created - timedelta(minutes=i)).isoformat().replace('+00:00', 'Z'),
+            'updated_at': created - timedelta(minutes=i),
+            'total_amount': f'{i * 3.5:.2f}',
+            'status': 'Pending' if i % 3 else 'Shipped   note',
+        })
+    return {
+        'next': None,
+        'previous': None,
+        'results': page,
+        'analytics': {
+            'total_sales': Decimal('123456.78'),
+            'day': date.today(),
+        },
+    }
+
+class Command(BaseCommand):
+    help = 'Compare FastJSONRenderer/FastJSONParser with the DRF stdlib classes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=500)
+        parser.add_argument('--items', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; FastJSONRenderer falls back to the stdlib renderer')
+        data = order_page(options['orders'], options['items'])
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+
+        expected = stdlib.render(data)
+        actual = fast.render(data)
+        if actual != expected:
+            raise CommandError('FastJSONRenderer output differs from JSONRenderer')
+        self.stdout.write(f"Output identical: {len(actual)} bytes")
+
+        repeat = options['repeat']
+        self.report('render', timeit.timeit(lambda: stdlib.render(data), number=repeat) / repeat,
+                    timeit.timeit(lambda: fast.render(data), number=repeat) / repeat)
+
+        stdlib_parser, fast_parser = JSONParser(), FastJSONParser()
+        if fast_parser.parse(io.BytesIO(expected)) != stdlib_parser.parse(io.BytesIO(expected)):
+            raise CommandError('FastJSONParser result differs from JSONParser')
+        self.report('parse', timeit.timeit(lambda: stdlib_parser.parse(io.BytesIO(expected)), number=repeat) / repeat,
+                    timeit.timeit(lambda: fast_parser.parse(io.BytesIO(expected)), number=repeat) / repeat)
+
+    def report(self, name, baseline, candidate):
+        self.stdout.write(
+            f"{name}: stdlib {baseline * 1000:.2f} ms, orjson {candidate * 1000:.2f} ms "
+            f"({baseline / candidate:.1f}x)"
+        )
@@ -0,0 +1,82 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from shopify.models import Customer, Product, Order, OrderItem, Payment
+from shopify.serializers import OrderItemSerializer, OrderSerializer, ProductSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare list serialization from model instances with the .values() fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per list page')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Insert this many orders first (rolled back afterwards)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self.seed(options['seed'])
+                for serializer_class in (ProductSerializer, OrderItemSerializer, OrderSerializer):
+                    self.compare(serializer_class, options['rows'], options['repeat'])
+                if options['seed']:
+                    raise Rollback
+        except Rollback:
+            pass
+
+    def compare(self, serializer_class, rows, repeat):
+        queryset = serializer_class.Meta.model.objects.order_by('pk')
+
+        def regular():
+            page = list(serializer_class.setup_eager_loading(queryset)[:rows])
+            return serializer_class(page, many=True).data
+
+        serializer = serializer_class()
+        columns = serializer.get_values_columns()
+
+        def fast():
+            return serializer.values_representation(list(queryset.values(*columns)[:rows]))
+
+        renderer = JSONRenderer()
+        if renderer.render(regular()) != renderer.render(fast()):
+            raise CommandError(f'{serializer_class.__name__}: fast path output differs')
+        baseline, candidate = self.time(regular, repeat), self.time(fast, repeat)
+        self.stdout.write(
+            f"{serializer_class.__name__} ({queryset[:rows].count()} rows): "
+            f"instances {baseline * 1000:.1f} ms, values {candidate * 1000:.1f} ms "
+            f"({baseline / candidate:.1f}x)"
+        )
+
+    @staticmethod
+    def time(func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def seed(count):
+        customer = Customer.objects.create(name='Benchmark', email=f'benchmark_{uuid.uuid4()}@example.com')
+        products = Product.objects.bulk_create(
+            Product(name=f'Benchmark product {i}', description='Benchmark', price='9.99', stock=100, sku=str(uuid.uuid4()))
+            for i in range(50)
+        )
+        orders = Order.objects.bulk_create(Order(customer=customer, total_amount='29.97') for _ in range(count))
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=products[(i + j) % len(products)], quantity=j + 1, unit_price='9.99')
+            for i, order in enumerate(orders) for j in range(3)
+        )
+        Payment.objects.bulk_create(Payment(order=order, amount='29.97', payment_method='Card') for order in orders)
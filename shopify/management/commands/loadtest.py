@@ -0,0 +1,64 @@
+import json
+import os
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from shopify.loadtest import ClientTarget, LiveTarget, load_entries, replay, summarize
+
+
+class Command(BaseCommand):
+    help = 'Record API traffic to a JSONL file, or replay one and report latency and queries per URL name'
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest='action', required=True)
+
+        record = subparsers.add_parser('record', help='Run the development server with request recording enabled')
+        record.add_argument('file')
+        record.add_argument('addrport', nargs='?', default='')
+
+        play = subparsers.add_parser('replay', help='Replay a recorded file')
+        play.add_argument('file')
+        play.add_argument('--target', help='Base URL of a live server (default: in-process test client)')
+        play.add_argument('--concurrency', type=int, default=1)
+        play.add_argument('--repeat', type=int, default=1)
+        play.add_argument('--read-only', action='store_true', help='Skip everything but GET/HEAD/OPTIONS')
+        play.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        if options['action'] == 'record':
+            # Environment rather than settings so the autoreloaded child sees it
+            os.environ['REQUEST_RECORD_FILE'] = os.path.abspath(options['file'])
+            self.stdout.write(f"Recording requests to {os.environ['REQUEST_RECORD_FILE']}")
+            args = [options['addrport']] if options['addrport'] else []
+            return call_command('runserver', *args)
+
+        try:
+            entries, skipped = load_entries(options['file'])
+        except OSError as exc:
+            raise CommandError(exc)
+        if options['read_only']:
+            entries = [entry for entry in entries if entry['method'].upper() in ('GET', 'HEAD', 'OPTIONS')]
+        if skipped:
+            self.stderr.write(f"Skipped {skipped} lines that are not recorded requests")
+        if not entries:
+            raise CommandError('Nothing to replay')
+
+        target = LiveTarget(options['target']) if options['target'] else ClientTarget()
+        results, elapsed = replay(entries, target, options['concurrency'], options['repeat'])
+        rows = summarize(results, elapsed)
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        self.stdout.write(
+            f"{len(results)} requests in {elapsed:.2f}s with concurrency {options['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'url name':<28}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}"
+        )
+        for row in rows:
+            queries = '-' if row['avg_queries'] is None else f"{row['avg_queries']:.1f}"
+            self.stdout.write(
+                f"{row['url_name']:<28}{row['requests']:>9}{row['errors']:>8}{row['p50_ms']:>9.1f}"
+                f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['rps']:>9.1f}{queries:>9}"
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from shopify.models import DailySales, DailyProductSales, CustomerSpend
+from shopify.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the sales rollup tables from the full order history'
+
+    def handle(self, *args, **options):
+        rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {DailySales.objects.count()} daily, "
+            f"{DailyProductSales.objects.count()} product and "
+            f"{CustomerSpend.objects.count()} customer rollup rows"
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from shopify.carts import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recompute cart totals from their items and report (and fix) any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+        parser.add_argument('--show', type=int, default=20, help='Number of drifted carts to list')
+
+    def handle(self, *args, **options):
+        drifted = reconcile(fix=not options['dry_run'])
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All cart totals match their items'))
+            return
+        drift = sum(abs(stored - expected) for _, stored, expected in drifted)
+        for pk, stored, expected in drifted[:options['show']]:
+            self.stdout.write(f"Cart {pk}: stored {stored}, items total {expected}")
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.WARNING(f"{verb} {len(drifted)} drifted carts, total drift ${drift}"))
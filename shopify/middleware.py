@@ -0,0 +1,177 @@
+import base64
+import json
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import profiling, routers
+
+
+# Both middlewares run natively in sync (WSGI) and async (ASGI) mode, so the
+# async views keep their event loop instead of being adapted into a thread.
+class HybridMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.ahandle(request)
+        return self.handle(request)
+
+# Appends every request to REQUEST_RECORD_FILE as one JSON line, in the format
+# `manage.py loadtest replay` reads back. Off unless the setting is given.
+class RequestRecorderMiddleware(HybridMiddleware):
+    lock = threading.Lock()
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_RECORD_FILE:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.path = settings.REQUEST_RECORD_FILE
+
+    def handle(self, request):
+        body, started = request.body, time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, body, response, started)
+        return response
+
+    async def ahandle(self, request):
+        body, started = request.body, time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, body, response, started)
+        return response
+
+    def record(self, request, body, response, started):
+        entry = {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'content_type': request.content_type if body else None,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+        if body:
+            try:
+                entry['body'] = body.decode()
+            except UnicodeDecodeError:
+                entry['body'] = base64.b64encode(body).decode()
+                entry['body_encoding'] = 'base64'
+        with self.lock, open(self.path, 'a', encoding='utf-8') as log:
+            log.write(json.dumps(entry) + '\n')
+
+# Profiles a request when a staff user sends the PROFILING_HEADER (e.g.
+# "X-Profile: 1") or it is picked by PROFILING_SAMPLE_RATE: database time and query count,
+# serializer and render time go out as a Server-Timing header and into the
+# per-view histograms served at /internal/profiling/.
+class ProfilingMiddleware(HybridMiddleware):
+    def handle(self, request):
+        if not (self.sampled() or self.requested(request) and self.header_allowed(request.user)):
+            return self.get_response(request)
+        profile, token = profiling.start()
+        try:
+            with self.wrap_connections(profile):
+                response = self.get_response(request)
+        finally:
+            profiling.stop(token)
+        return self.finish(request, response, profile)
+
+    async def ahandle(self, request):
+        if not (self.sampled() or self.requested(request) and self.header_allowed(await request.auser())):
+            return await self.get_response(request)
+        profile, token = profiling.start()
+        try:
+            # Connections are per thread: the wrappers go on the ones in the
+            # thread the async ORM runs this request's queries in
+            wrappers = await sync_to_async(self.wrap_connections)(profile)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(wrappers.close)()
+        finally:
+            profiling.stop(token)
+        return self.finish(request, response, profile)
+
+    @staticmethod
+    def wrap_connections(profile):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile.execute))
+        return stack
+
+    @staticmethod
+    def finish(request, response, profile):
+        total = time.perf_counter() - profile.started
+        response['Server-Timing'] = profile.server_timing(total)
+        match = request.resolver_match
+        if match is not None and match.url_name:
+            profiling.record(match.url_name, profile, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns
+        profile = profiling.current()
+        if profile is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(lambda _: profile.add('render', time.perf_counter() - started))
+        return response
+
+    @staticmethod
+    def requested(request):
+        header = settings.PROFILING_HEADER
+        return bool(header) and request.headers.get(header) not in (None, '', '0')
+
+    @staticmethod
+    def header_allowed(user):
+        # Server-Timing exposes per-request database timings
+        return settings.PROFILING_HEADER_PUBLIC or user.is_staff
+
+    @staticmethod
+    def sampled():
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+# Sends the reads of safe requests to views marked replica_reads = True to
+# DATABASE_REPLICAS (see routers.py). Writes pin the client to the primary for
+# REPLICA_PIN_SECONDS (cookie, X-Read-Primary-Until header and, for signed-in
+# users, the cache), so it reads its own writes even when the replicas lag.
+# Off unless replicas are configured.
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def handle(self, request):
+        use_replica = routers.reads_from_replica(request, request.user)
+        with routers.replica_reads(use_replica):
+            response = self.get_response(request)
+        if request.method not in routers.SAFE_METHODS:
+            routers.pin(request, response)
+        return self.finish(response, use_replica)
+
+    async def ahandle(self, request):
+        use_replica = routers.replica_view(request) and not await sync_to_async(routers.is_pinned)(
+            request, await request.auser()
+        )
+        with routers.replica_reads(use_replica):
+            response = await self.get_response(request)
+        if request.method not in routers.SAFE_METHODS:
+            await sync_to_async(routers.pin)(request, response)
+        return self.finish(response, use_replica)
+
+    @staticmethod
+    def finish(response, use_replica):
+        if use_replica and response.streaming and not response.is_async:
+            response.streaming_content = routers.stream_from_replica(response.streaming_content)
+        return response
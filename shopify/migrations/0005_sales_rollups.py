@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    # Existing orders would otherwise be missing from the analytics until
+    # rebuild_sales_rollups is run by hand. Same aggregates as
+    # shopify.rollups.rebuild_rollups, on the historical models.
+    Order = apps.get_model('shopify', 'Order')
+    OrderItem = apps.get_model('shopify', 'OrderItem')
+    DailySales = apps.get_model('shopify', 'DailySales')
+    DailyProductSales = apps.get_model('shopify', 'DailyProductSales')
+    CustomerSpend = apps.get_model('shopify', 'CustomerSpend')
+
+    daily = (
+        Order.objects.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(order_count=Count('pk'), total_sales=Sum('total_amount'))
+    )
+    DailySales.objects.bulk_create(
+        DailySales(date=row['day'], order_count=row['order_count'], total_sales=row['total_sales'] or 0)
+        for row in daily
+    )
+
+    per_product = (
+        OrderItem.objects.order_by()
+        .annotate(day=TruncDate('order__created_at'))
+        .values('day', 'product_id')
+        .annotate(total_quantity=Sum('quantity'))
+    )
+    DailyProductSales.objects.bulk_create(
+        DailyProductSales(date=row['day'], product_id=row['product_id'], quantity=row['total_quantity'])
+        for row in per_product
+    )
+
+    per_customer = (
+        Order.objects.order_by()
+        .values('customer_id')
+        .annotate(order_count=Count('pk'), total_spent=Sum('total_amount'))
+    )
+    CustomerSpend.objects.bulk_create(
+        CustomerSpend(customer_id=row['customer_id'], order_count=row['order_count'], total_spent=row['total_spent'] or 0)
+        for row in per_customer
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shopify', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('order_count', models.IntegerField(default=0)),
+                ('total_sales', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CustomerSpend',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='spend', serialize=False, to='shopify.customer')),
+                ('order_count', models.IntegerField(default=0)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_spent'], name='customer_spend_total_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('quantity', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='shopify.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'product'), name='unique_daily_product_sales')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
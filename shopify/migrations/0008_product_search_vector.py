@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+SEARCH_VECTOR_SQL = [
+    """
+    ALTER TABLE shopify_product ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX product_search_vector_idx ON shopify_product USING gin (search_vector)",
+]
+
+DROP_SEARCH_VECTOR_SQL = [
+    "DROP INDEX IF EXISTS product_search_vector_idx",
+    "ALTER TABLE shopify_product DROP COLUMN IF EXISTS search_vector",
+]
+
+
+# The tsvector column exists only on PostgreSQL and is not part of the model
+# state; shopify.search queries it directly and falls back elsewhere.
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in SEARCH_VECTOR_SQL:
+            schema_editor.execute(statement)
+
+def remove_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in DROP_SEARCH_VECTOR_SQL:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shopify', '0007_stock_reservations'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
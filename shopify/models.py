@@ -25,6 +25,9 @@ class Customer(TimeStampedModel):
         ordering = ['-created_at']
         verbose_name = 'Customer'
         verbose_name_plural = 'Customers'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='customer_created_keyset_idx'),
+        ]
 
 # Category model
 class Category(models.Model):
@@ -48,6 +51,13 @@ class Product(TimeStampedModel):
     def __str__(self):
         return f"{self.name} - ${self.price}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='product_created_keyset_idx'),
+            # Active products of a category, newest first (/products/?category= keyset pages)
+            models.Index(fields=['category', 'created_at', 'id'], name='product_active_category_idx', condition=models.Q(is_active=True)),
+        ]
+
 # Cart model
 class Cart(TimeStampedModel):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='carts')
@@ -56,6 +66,11 @@ class Cart(TimeStampedModel):
     def __str__(self):
         return f"Cart for {self.customer} (ID: {self.id})"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='cart_created_keyset_idx'),
+        ]
+
 # Cart item model
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
@@ -73,16 +88,33 @@ class Wishlist(TimeStampedModel):
     def __str__(self):
         return f"Wishlist for {self.customer.name} (ID: {self.id})"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='wishlist_created_keyset_idx'),
+        ]
+
 # Order model
 class Order(TimeStampedModel):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='orders')
+    # Indexed by order_customer_created_idx, which leads with customer
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='orders', db_index=False)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=20, default='Pending')
 
     def __str__(self):
         return f"Order {self.id} - {self.customer}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'uuid'], name='order_created_keyset_idx'),
+            models.Index(fields=['created_at', 'total_amount'], name='order_created_amount_idx'),
+            # A customer's orders, newest first (/orders/?customer_id= keyset pages);
+            # also serves the customer foreign key
+            models.Index(fields=['customer', 'created_at', 'uuid'], name='order_customer_created_idx'),
+            # Status filters over a date range (exports, fulfilment queues)
+            models.Index(fields=['status', 'created_at'], name='order_status_created_idx'),
+        ]
+
 # Order item model
 class OrderItem(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -109,6 +141,11 @@ class Payment(TimeStampedModel):
     def __str__(self):
         return f"Payment for Order {self.order.id} - Amount: ${self.amount}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='payment_created_keyset_idx'),
+        ]
+
 # Shipment model
 class Shipment(TimeStampedModel):
     STATUS_CHOICES = [
@@ -127,3 +164,75 @@ class Shipment(TimeStampedModel):
 
     def __str__(self):
         return f"Shipment for Order {self.order.id} - Tracking Number: {self.tracking_number}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='shipment_created_keyset_idx'),
+        ]
+
+# Sales rollups, maintained incrementally from Order/OrderItem writes (see rollups.py)
+# A day is spread over ROLLUP_SHARDS rows, so concurrent checkouts do not all
+# queue on one row lock; readers sum the shards of each date.
+class DailySales(models.Model):
+    date = models.DateField()
+    shard = models.SmallIntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+    total_sales = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.date} (shard {self.shard}): {self.order_count} orders, ${self.total_sales}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'shard'], name='unique_daily_sales_shard'),
+        ]
+
+class DailyProductSales(models.Model):
+    date = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    quantity = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.date}: {self.quantity} x {self.product_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'product'], name='unique_daily_product_sales'),
+        ]
+
+class CustomerSpend(models.Model):
+    customer = models.OneToOneField(Customer, on_delete=models.CASCADE, primary_key=True, related_name='spend')
+    order_count = models.IntegerField(default=0)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.customer_id} spent ${self.total_spent}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_spent'], name='customer_spend_total_idx'),
+        ]
+
+# Stock held for an order between checkout and payment (see inventory.py)
+class StockReservation(TimeStampedModel):
+    RESERVED = 'Reserved'
+    COMMITTED = 'Committed'
+    RELEASED = 'Released'
+    STATUS_CHOICES = [
+        (RESERVED, 'Reserved'),
+        (COMMITTED, 'Committed'),
+        (RELEASED, 'Released'),
+    ]
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='reservations')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations')
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=RESERVED)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} for Order {self.order_id} ({self.status})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='reservation_expiry_idx'),
+        ]
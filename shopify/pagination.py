@@ -0,0 +1,155 @@
+import base64
+import json
+from types import SimpleNamespace
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# Keyset pagination: the cursor carries the ordering values of the boundary row,
+# so every page is a `WHERE (created_at, pk) < (...)` index range scan instead of
+# an OFFSET that grows with page depth.
+class KeysetPagination(BasePagination):
+    ordering = ('-created_at', '-pk')
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # For async views: the same page, fetched with the async ORM
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([row async for row in page_queryset.aiterator()])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, 'ordering', None) or self.ordering)
+        self.fields = [self._get_field(queryset.model, name) for name in self.ordering]
+
+        self.cursor = cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = [self._invert(name) for name in self.ordering] if reverse else list(self.ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, cursor['values']))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        cursor = self.cursor
+        reverse = bool(cursor and cursor['reverse'])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value:
+            try:
+                size = int(value)
+            except ValueError:
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size)
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        # Pages fetched with .values() hold the same columns, keyed by attname
+        if isinstance(obj, dict):
+            obj = SimpleNamespace(**obj)
+        values = [field.value_to_string(obj) for field in self.fields]
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            raw_values = payload['v']
+            if len(raw_values) != len(self.fields):
+                raise ValueError
+            values = [field.to_python(value) for field, value in zip(self.fields, raw_values)]
+            if any(value is None for value in values):
+                raise ValueError
+            return {'values': values, 'reverse': bool(payload.get('r'))}
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _keyset_filter(self, ordering, values):
+        # (a, b) past (x, y)  ==  a past x  OR  (a = x AND b past y)
+        condition = Q()
+        for index in reversed(range(len(ordering))):
+            name = ordering[index].lstrip('-')
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            if index < len(ordering) - 1:
+                step |= Q(**{name: values[index]}) & condition
+            condition = step
+        return condition
+
+    @staticmethod
+    def _invert(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    @staticmethod
+    def _get_field(model, name):
+        name = name.lstrip('-')
+        if name == 'pk':
+            return model._meta.pk
+        return model._meta.get_field(name)
@@ -0,0 +1,55 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# Runs independent read-only query functions at the same time, each on a
+# pool thread with its own database connection, so a view waits for the
+# slowest query rather than the sum of them. Pool threads keep their
+# connections between calls (subject to CONN_MAX_AGE, like request threads).
+#
+# Falls back to running them one after another when ANALYTICS_QUERY_WORKERS
+# is 1 or the caller is inside a transaction: other connections cannot see
+# its uncommitted rows.
+def fan_out(funcs):
+    if not _parallel_allowed(funcs):
+        return [func() for func in funcs]
+    return [future.result() for future in [_submit(func) for func in funcs]]
+
+async def afan_out(funcs):
+    if not await sync_to_async(_parallel_allowed)(funcs):
+        return [await sync_to_async(func)() for func in funcs]
+    return await asyncio.gather(*(asyncio.wrap_future(_submit(func)) for func in funcs))
+
+def _parallel_allowed(funcs):
+    if settings.ANALYTICS_QUERY_WORKERS <= 1 or len(funcs) <= 1:
+        return False
+    return not any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+def _submit(func):
+    # Pool threads run in the caller's context (e.g. replica routing)
+    return _get_executor().submit(contextvars.copy_context().run, _run, func)
+
+def _run(func):
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ANALYTICS_QUERY_WORKERS, thread_name_prefix='shopify-queries'
+            )
+        return _executor
@@ -0,0 +1,142 @@
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+from django.core.cache import caches
+from django.conf import settings
+from django.urls import get_resolver
+
+
+# Per-request profile filled in by ProfilingMiddleware: database time and
+# query count from an execute_wrapper, plus named spans ("serializer",
+# "render") timed by the code that does the work. Spans nest without double
+# counting, so a serializer that renders nested serializers is timed once.
+_current = ContextVar('shopify_profile', default=None)
+_inactive = nullcontext()
+
+# Upper bounds (ms) of the response time histogram buckets; the last is open
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+COUNTERS = ('requests', 'queries', 'total_us', 'db_us', 'serializer_us', 'render_us')
+
+
+class Profile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.spans = {}
+        self.depth = {}
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def server_timing(self, total):
+        entries = [f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"']
+        entries += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in sorted(self.spans.items())]
+        entries.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(entries)
+
+class _Span:
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        depth = self.profile.depth.get(self.name, 0)
+        self.profile.depth[self.name] = depth + 1
+        self.outermost = depth == 0
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profile.depth[self.name] -= 1
+        if self.outermost:
+            self.profile.add(self.name, time.perf_counter() - self.started)
+
+def start():
+    profile = Profile()
+    return profile, _current.set(profile)
+
+def stop(token):
+    _current.reset(token)
+
+def current():
+    return _current.get()
+
+def span(name):
+    profile = _current.get()
+    return _inactive if profile is None else profile.span(name)
+
+# Histograms live in the cache as integer counters per view, so every worker
+# process adds to the same numbers (the same scheme as catalog_cache.record).
+def get_cache():
+    return caches[settings.PROFILING_CACHE_ALIAS]
+
+def _key(view, name):
+    return f'profiling:{view}:{name}'
+
+def _incr(cache, key, amount):
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+def record(view, profile, total):
+    cache = get_cache()
+    values = {
+        'requests': 1,
+        'queries': profile.queries,
+        'total_us': int(total * 1e6),
+        'db_us': int(profile.db * 1e6),
+        'serializer_us': int(profile.spans.get('serializer', 0) * 1e6),
+        'render_us': int(profile.spans.get('render', 0) * 1e6),
+        f'bucket:{bisect_left(BUCKETS, total * 1000)}': 1,
+    }
+    for name, amount in values.items():
+        if amount:
+            _incr(cache, _key(view, name), amount)
+
+def view_names():
+    return sorted({pattern.name for pattern in get_resolver().url_patterns if getattr(pattern, 'name', None)})
+
+def stats():
+    cache = get_cache()
+    names = [*COUNTERS, *[f'bucket:{index}' for index in range(len(BUCKETS) + 1)]]
+    views = view_names()
+    found = cache.get_many([_key(view, name) for view in views for name in names])
+    results = {}
+    for view in views:
+        counts = {name: found.get(_key(view, name), 0) for name in names}
+        requests = counts['requests']
+        if not requests:
+            continue
+        results[view] = {
+            'requests': requests,
+            'avg_queries': round(counts['queries'] / requests, 2),
+            'avg_ms': {
+                part: round(counts[f'{part}_us'] / requests / 1000, 2)
+                for part in ('total', 'db', 'serializer', 'render')
+            },
+            'histogram': [
+                {'le_ms': bound, 'count': counts[f'bucket:{index}']}
+                for index, bound in enumerate((*BUCKETS, None))
+            ],
+        }
+    return results
+
+def reset():
+    cache = get_cache()
+    names = [*COUNTERS, *[f'bucket:{index}' for index in range(len(BUCKETS) + 1)]]
+    cache.delete_many([_key(view, name) for view in view_names() for name in names])
@@ -0,0 +1,126 @@
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Order, OrderItem, DailySales, DailyProductSales, CustomerSpend
+
+
+# Snapshots are the parts of an Order/OrderItem that feed the rollups; writes
+# subtract the previous snapshot and add the new one as F() deltas.
+def order_snapshot(order):
+    return {
+        'customer_id': order.customer_id,
+        'date': timezone.localdate(order.created_at),
+        'amount': _to_decimal(order.total_amount),
+    }
+
+def stored_order_snapshot(pk):
+    row = Order.objects.filter(pk=pk).values('customer_id', 'created_at', 'total_amount').first()
+    if row is None:
+        return None
+    return {
+        'customer_id': row['customer_id'],
+        'date': timezone.localdate(row['created_at']),
+        'amount': row['total_amount'],
+    }
+
+def item_snapshot(item, created_at=None):
+    if created_at is None:
+        created_at = item.order.created_at
+    return {
+        'product_id': item.product_id,
+        'date': timezone.localdate(created_at),
+        'quantity': item.quantity,
+    }
+
+def stored_item_snapshot(pk):
+    row = OrderItem.objects.filter(pk=pk).values('product_id', 'quantity', 'order__created_at').first()
+    if row is None:
+        return None
+    return {
+        'product_id': row['product_id'],
+        'date': timezone.localdate(row['order__created_at']),
+        'quantity': row['quantity'],
+    }
+
+def add_order(snapshot, sign=1):
+    amount = sign * snapshot['amount']
+    # Any shard of the day takes the delta, a subtraction too (a shard may go
+    # negative, only the sum is read), so its row may not exist yet
+    lookup = {'date': snapshot['date'], 'shard': random.randrange(settings.ROLLUP_SHARDS)}
+    _apply(DailySales, lookup, {'order_count': sign, 'total_sales': amount}, create=True)
+    _apply(CustomerSpend, {'customer_id': snapshot['customer_id']}, {'order_count': sign, 'total_spent': amount}, create=sign > 0)
+
+def remove_order(snapshot):
+    add_order(snapshot, sign=-1)
+
+def add_item(snapshot, sign=1):
+    lookup = {'date': snapshot['date'], 'product_id': snapshot['product_id']}
+    _apply(DailyProductSales, lookup, {'quantity': sign * snapshot['quantity']}, create=sign > 0)
+
+def remove_item(snapshot):
+    add_item(snapshot, sign=-1)
+
+def add_items(items, created_at):
+    # For bulk_create paths, which bypass model signals: one delta per product
+    quantities = {}
+    for item in items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    date = timezone.localdate(created_at)
+    for product_id, quantity in quantities.items():
+        add_item({'product_id': product_id, 'date': date, 'quantity': quantity})
+
+@transaction.atomic
+def rebuild_rollups():
+    DailySales.objects.all().delete()
+    DailyProductSales.objects.all().delete()
+    CustomerSpend.objects.all().delete()
+
+    daily = (
+        Order.objects.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(order_count=Count('pk'), total_sales=Sum('total_amount'))
+    )
+    DailySales.objects.bulk_create(
+        DailySales(date=row['day'], order_count=row['order_count'], total_sales=row['total_sales'] or 0)
+        for row in daily
+    )
+
+    per_product = (
+        OrderItem.objects.order_by()
+        .annotate(day=TruncDate('order__created_at'))
+        .values('day', 'product_id')
+        .annotate(total_quantity=Sum('quantity'))
+    )
+    DailyProductSales.objects.bulk_create(
+        DailyProductSales(date=row['day'], product_id=row['product_id'], quantity=row['total_quantity'])
+        for row in per_product
+    )
+
+    per_customer = (
+        Order.objects.order_by()
+        .values('customer_id')
+        .annotate(order_count=Count('pk'), total_spent=Sum('total_amount'))
+    )
+    CustomerSpend.objects.bulk_create(
+        CustomerSpend(customer_id=row['customer_id'], order_count=row['order_count'], total_spent=row['total_spent'] or 0)
+        for row in per_customer
+    )
+
+def _apply(model, lookup, deltas, create):
+    # Subtractions always target a row an earlier addition created, so they
+    # never need the extra get_or_create round trip.
+    if create:
+        _, created = model.objects.get_or_create(**lookup, defaults=deltas)
+        if created:
+            return
+    model.objects.filter(**lookup).update(**{name: F(name) + value for name, value in deltas.items()})
+
+def _to_decimal(value):
+    return Order._meta.get_field('total_amount').to_python(value) or Decimal('0')
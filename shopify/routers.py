@@ -0,0 +1,98 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = 'read-primary-until'
+PIN_HEADER = 'X-Read-Primary-Until'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+# Reads go to one of DATABASE_REPLICAS only inside replica_reads(), which
+# ReplicaRoutingMiddleware opens for safe requests to views declaring
+# replica_reads = True. Everything else, including reads inside a transaction
+# on the primary, stays on the primary.
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _replica_reads.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Never follow instance._state.db back to a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        return db not in settings.DATABASE_REPLICAS
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+def stream_from_replica(content):
+    # Streaming responses are consumed after the middleware returns, so each
+    # chunk is produced inside its own replica_reads() block
+    iterator = iter(content)
+    while True:
+        with replica_reads():
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+# Read-your-writes: after a write the client reads from the primary until the
+# replicas have (most likely) caught up. The deadline goes out as a cookie and
+# as a response header for clients without a cookie jar to send back, and is
+# kept in the cache for the authenticated user.
+def pin(request, response):
+    seconds = settings.REPLICA_PIN_SECONDS
+    until = time.time() + seconds
+    response.set_cookie(PIN_COOKIE, str(until), max_age=seconds, httponly=True, samesite='Lax')
+    response[PIN_HEADER] = str(until)
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        _get_cache().set(_pin_key(user), until, seconds)
+
+def is_pinned(request, user=None):
+    for until in (request.COOKIES.get(PIN_COOKIE), request.headers.get(PIN_HEADER)):
+        try:
+            if until and float(until) > time.time():
+                return True
+        except ValueError:
+            pass
+    return user is not None and user.is_authenticated and _get_cache().get(_pin_key(user), 0) > time.time()
+
+def replica_view(request):
+    if request.method not in SAFE_METHODS:
+        return False
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return getattr(getattr(match.func, 'view_class', None), 'replica_reads', False)
+
+def reads_from_replica(request, user=None):
+    return replica_view(request) and not is_pinned(request, user)
+
+def _get_cache():
+    return caches[settings.REPLICA_PIN_CACHE_ALIAS]
+
+def _pin_key(user):
+    return f'replica:pin:user:{user.pk}'
@@ -0,0 +1,48 @@
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Product
+
+
+# Full-text search over Product.name/description.
+#
+# On PostgreSQL, migration 0008 adds a stored generated tsvector column
+# (name weighted A, description B) with a GIN index, so the database keeps it in
+# step with every write, including bulk and queryset updates, and a query only
+# touches matching rows. Other backends (SQLite test runs) fall back to term
+# matching with a Python-side rank.
+SEARCH_CONFIG = 'english'
+MAX_LIMIT = 100
+
+def search_products(query, category=None, limit=20):
+    queryset = Product.objects.filter(is_active=True)
+    if category is not None:
+        queryset = queryset.filter(category_id=category)
+    limit = max(1, min(limit, MAX_LIMIT))
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(queryset, query, limit)
+    return _search_fallback(queryset, query, limit)
+
+def _search_postgresql(queryset, query, limit):
+    column = f'{Product._meta.db_table}.search_vector'
+    tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+    return list(
+        queryset.filter(RawSQL(f'{column} @@ {tsquery}', (query,), output_field=BooleanField()))
+        .annotate(rank=RawSQL(f'ts_rank({column}, {tsquery})', (query,), output_field=FloatField()))
+        .order_by('-rank', 'pk')[:limit]
+    )
+
+def _search_fallback(queryset, query, limit):
+    terms = [term.lower() for term in query.split() if term]
+    if not terms:
+        return []
+    for term in terms:
+        queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+    products = list(queryset)
+    for product in products:
+        name, description = product.name.lower(), product.description.lower()
+        hits = sum(name.count(term) * 2 + description.count(term) for term in terms)
+        product.rank = hits / (1 + len(name.split()) + len(description.split()))
+    products.sort(key=lambda product: (-product.rank, product.pk))
+    return products[:limit]
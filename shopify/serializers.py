@@ -1,49 +1,429 @@
+from collections import Counter
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import FileField, Prefetch
+from django.utils.functional import cached_property
+from django.utils.timezone import now
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.validators import UniqueValidator
+
+from . import autocomplete, carts, catalog_cache, profiling, rollups
+from .inventory import release_quantities, reserve_stock
 
 from .models import (
-    Customer, Cart, Wishlist, Product, Category,
+    Customer, Cart, CartItem, Wishlist, Product, Category,
     Order, OrderItem, Payment, Shipment
 )
 import uuid
 
-class CustomerSerializer(serializers.ModelSerializer):
+def sparse_fieldset_params(request):
+    # ?fields=a,b and ?expand=c apply to reads only; writes validate every field
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+
+    def split(name):
+        return {value.strip() for value in request.query_params.get(name, '').split(',') if value.strip()}
+
+    return split('fields') or None, split('expand')
+
+def _prefetch_lookup(lookup):
+    return lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+
+def _prefix_prefetch(lookup, prefix):
+    if isinstance(lookup, Prefetch):
+        return Prefetch(prefix + lookup.prefetch_through, queryset=lookup.queryset)
+    return prefix + lookup
+
+# Serializers declare the relations they render so views can load them up front
+# instead of issuing one query per row for every nested/related field. With a
+# sparse fieldset, relations that are not rendered are skipped and only the
+# requested columns are selected.
+class EagerLoadingMixin:
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=(), required=()):
+        select, prefetch = cls.get_eager_lookups(fields, expand)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if fields:
+            concrete = {field.name for field in cls.Meta.model._meta.concrete_fields}
+            columns = [name for name in fields if name in concrete]
+            queryset = queryset.only(*columns, *[name for name in required if name in concrete])
+        return queryset
+
+    @classmethod
+    def get_eager_lookups(cls, fields=None, expand=(), prefix=''):
+        def wanted(lookup):
+            return fields is None or lookup.split('__')[0] in fields
+
+        expand = [name for name in expand if name in cls.expandable_fields and wanted(name)]
+        select = [prefix + lookup for lookup in cls.select_related_fields if wanted(lookup)]
+        prefetch = [
+            _prefix_prefetch(lookup, prefix) for lookup in cls.prefetch_related_fields
+            if wanted(_prefetch_lookup(lookup)) and _prefetch_lookup(lookup) not in expand
+        ]
+        for name in expand:
+            nested = globals()[cls.expandable_fields[name][0]]
+            nested_select, nested_prefetch = nested.get_eager_lookups(prefix=f'{prefix}{name}__')
+            field = cls.Meta.model._meta.get_field(name)
+            if field.many_to_many or field.one_to_many:
+                prefetch += [prefix + name, *nested_select, *nested_prefetch]
+            else:
+                select += [prefix + name, *nested_select]
+                prefetch += nested_prefetch
+        return select, prefetch
+
+# ?fields= drops unrequested fields and ?expand= swaps a primary key for the
+# nested representation listed in expandable_fields. Only the top-level
+# serializer of a request is affected; nested serializers render in full.
+class SparseFieldsMixin:
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        if parent is not None:
+            return fields
+        requested, expand = sparse_fieldset_params(self.context.get('request'))
+        for name in expand:
+            if name in self.expandable_fields and name in fields:
+                serializer_name, kwargs = self.expandable_fields[name]
+                fields[name] = globals()[serializer_name](read_only=True, **kwargs)
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields
+
+    def to_representation(self, instance):
+        with profiling.span('serializer'):
+            return super().to_representation(instance)
+
+# Related field that can be fed objects a BulkListSerializer loaded up front,
+# so a list payload costs one IN query per relation instead of one per row.
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    prefetched = None
+
+    def to_internal_value(self, data):
+        if self.prefetched is None:
+            return super().to_internal_value(data)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in self.prefetched:
+            self.fail('does_not_exist', pk_value=data)
+        return self.prefetched[pk]
+
+class BulkListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch_related_objects(data)
+        return super().to_internal_value(data)
+
+    def prefetch_related_objects(self, data):
+        for name, field in self.child.fields.items():
+            if field.read_only or not isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                continue
+            pk_field = field.get_queryset().model._meta.pk
+            pks = set()
+            for row in data:
+                if not isinstance(row, dict) or row.get(name) is None:
+                    continue
+                try:
+                    pks.add(pk_field.to_python(row[name]))
+                except (DjangoValidationError, TypeError):
+                    pass
+            field.prefetched = field.get_queryset().in_bulk(pks)
+
+# Read-only fast path for list pages: rows come straight from .values() and
+# each column goes through the bound field's to_representation only when its
+# type needs it, so the output matches to_representation() without model
+# instances or per-field get_attribute. Reverse relations rendered as nested
+# serializers or primary key lists cost one query each, grouped by parent key.
+# get_values_columns() returns None for anything this cannot render (computed
+# fields, dotted sources, ?expand=), and callers fall back to the regular path.
+class ValuesRepresentationMixin:
+    passthrough_field_types = (
+        serializers.CharField, serializers.EmailField, serializers.SlugField,
+        serializers.IntegerField, serializers.BooleanField,
+    )
+
+    def get_values_columns(self):
+        plan = self._values_plan
+        return None if plan is None else plan['columns']
+
+    def values_representation(self, rows):
+        with profiling.span('serializer'):
+            return self._values_representation(rows)
+
+    def _values_representation(self, rows):
+        plan = self._values_plan
+        keys = [row[plan['key']] for row in rows]
+        nested = {name: load(keys) for name, load in plan['nested'].items()}
+        results = []
+        for row in rows:
+            item = {}
+            for name, attname, convert in plan['fields']:
+                if name in nested:
+                    item[name] = nested[name].get(row[attname], [])
+                    continue
+                value = row[attname]
+                item[name] = value if value is None or convert is None else convert(value)
+            results.append(item)
+        return results
+
+    @cached_property
+    def _values_plan(self):
+        model = self.Meta.model
+        key = model._meta.pk.attname
+        fields, nested, columns = [], {}, {key}
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if model_field.one_to_many and model_field.auto_created:
+                load = self._values_loader(field, model_field)
+                if load is None:
+                    return None
+                nested[name] = load
+                fields.append((name, key, None))
+                continue
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+            if isinstance(field, serializers.BaseSerializer):
+                return None
+            if isinstance(model_field, FileField):
+                convert = self._file_converter(field, model_field)
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                # .values() already holds the related primary key
+                convert = None if field.pk_field is None else field.pk_field.to_representation
+            elif type(field) in self.passthrough_field_types:
+                convert = None
+            else:
+                convert = field.to_representation
+            fields.append((name, model_field.attname, convert))
+            columns.add(model_field.attname)
+        return {'key': key, 'fields': fields, 'nested': nested, 'columns': sorted(columns)}
+
+    @staticmethod
+    def _values_loader(field, relation):
+        manager = relation.related_model._default_manager
+        foreign_key = relation.field.attname
+
+        if isinstance(field, serializers.ListSerializer) and isinstance(field.child, ValuesRepresentationMixin):
+            child = field.child
+            columns = child.get_values_columns()
+            if columns is None:
+                return None
+
+            def load(keys):
+                rows = list(manager.filter(**{f'{foreign_key}__in': keys}).values(*columns, foreign_key))
+                groups = {}
+                for row, item in zip(rows, child.values_representation(rows)):
+                    groups.setdefault(row[foreign_key], []).append(item)
+                return groups
+            return load
+
+        if (isinstance(field, serializers.ManyRelatedField)
+                and isinstance(field.child_relation, serializers.PrimaryKeyRelatedField)
+                and field.child_relation.pk_field is None):
+            pk = relation.related_model._meta.pk.attname
+
+            def load(keys):
+                groups = {}
+                for parent, value in manager.filter(**{f'{foreign_key}__in': keys}).values_list(foreign_key, pk):
+                    groups.setdefault(parent, []).append(value)
+                return groups
+            return load
+        return None
+
+    @staticmethod
+    def _file_converter(field, model_field):
+        def convert(name):
+            return field.to_representation(model_field.attr_class(None, model_field, name))
+        return convert
+
+class CustomerSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = Customer
         fields = '__all__'
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {'customer': ('CustomerSerializer', {})}
     customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
 
     class Meta:
         model = Cart
         fields = '__all__'
+        # Maintained from the cart's items (see carts.py)
+        read_only_fields = ('total_amount',)
+
+class CartItemSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'cart': ('CartSerializer', {}),
+        'product': ('ProductSerializer', {}),
+    }
+    cart = serializers.PrimaryKeyRelatedField(queryset=Cart.objects.all())
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    quantity = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta:
+        model = CartItem
+        fields = '__all__'
+
+    # The cart total moves in the CartItem signals; keep it in this transaction
+    def create(self, validated_data):
+        with transaction.atomic():
+            return super().create(validated_data)
 
-class WishlistSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            return super().update(instance, validated_data)
+
+class WishlistSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'customer': ('CustomerSerializer', {}),
+        'products': ('ProductSerializer', {'many': True}),
+    }
+    prefetch_related_fields = (
+        Prefetch('products', queryset=Product.objects.only('id')),
+    )
     customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
 
     class Meta:
         model = Wishlist
         fields = '__all__'
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductListSerializer(BulkListSerializer):
+    # Upserts by sku: existing products are updated, new ones inserted
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        sku = self.child.fields.get('sku')
+        if sku is not None:
+            sku.validators = [v for v in sku.validators if not isinstance(v, UniqueValidator)]
+
+    def validate(self, attrs):
+        counts = Counter(row['sku'] for row in attrs)
+        duplicates = sorted(sku for sku, count in counts.items() if count > 1)
+        if duplicates:
+            raise serializers.ValidationError(f"Duplicate skus in payload: {duplicates}")
+        return attrs
+
+    def create(self, validated_data):
+        existing = Product.objects.filter(sku__in=[row['sku'] for row in validated_data]).in_bulk(field_name='sku')
+        products, created, updated, repriced, fields = [], [], [], {}, {'updated_at'}
+        timestamp = now()
+        for row in validated_data:
+            product = existing.get(row['sku'])
+            if product is None:
+                product = Product(**row)
+                created.append(product)
+            else:
+                if 'price' in row:
+                    repriced[product.pk] = row['price'] - product.price
+                for name, value in row.items():
+                    setattr(product, name, value)
+                product.updated_at = timestamp
+                fields.update(row)
+                updated.append(product)
+            products.append(product)
+        with transaction.atomic():
+            Product.objects.bulk_create(created, batch_size=500)
+            if updated:
+                Product.objects.bulk_update(updated, sorted(fields), batch_size=500)
+            carts.reprice(repriced)
+            # bulk writes skip the Product signals that reprice carts,
+            # invalidate the cache and maintain the autocomplete index
+            catalog_cache.invalidate_products([product.pk for product in updated])
+            transaction.on_commit(lambda: autocomplete.index.update_many(products))
+        return products
+
+class ProductSerializer(ValuesRepresentationMixin, SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {'category': ('CategorySerializer', {})}
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = Product
         fields = '__all__'
+        list_serializer_class = ProductListSerializer
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(ValuesRepresentationMixin, SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
-class OrderItemSerializer(serializers.ModelSerializer):
-    order = serializers.PrimaryKeyRelatedField(queryset=Order.objects.all())
-    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+class OrderItemListSerializer(BulkListSerializer):
+    def create(self, validated_data):
+        items = [OrderItem(**row) for row in validated_data]
+        orders = {}
+        for item in items:
+            orders.setdefault(item.order.pk, (item.order, []))[1].append(item)
+        with transaction.atomic():
+            for order, order_items in orders.values():
+                reserve_stock(order, [(item.product_id, item.quantity) for item in order_items])
+            OrderItem.objects.bulk_create(items, batch_size=500)
+            # bulk_create skips the OrderItem signals that maintain the rollups
+            for order, order_items in orders.values():
+                rollups.add_items(order_items, order.created_at)
+        return items
+
+class OrderItemSerializer(ValuesRepresentationMixin, SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'order': ('OrderSerializer', {}),
+        'product': ('ProductSerializer', {}),
+    }
+    order = PrefetchedPrimaryKeyRelatedField(queryset=Order.objects.all())
+    product = PrefetchedPrimaryKeyRelatedField(queryset=Product.objects.all())
 
     class Meta:
         model = OrderItem
         fields = '__all__'
+        list_serializer_class = OrderItemListSerializer
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            reserve_stock(validated_data['order'], [(validated_data['product'].pk, validated_data.get('quantity', 1))])
+            return super().create(validated_data)
 
-class OrderSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        # Only the change is reserved or given back; a new order or product
+        # moves the whole line. Deletes are released by the post_delete signal.
+        with transaction.atomic():
+            order_id, product_id, quantity = (
+                OrderItem.objects.select_for_update().filter(pk=instance.pk)
+                .values_list('order_id', 'product_id', 'quantity').get()
+            )
+            order = validated_data.get('order', instance.order)
+            new_product_id = validated_data['product'].pk if 'product' in validated_data else product_id
+            new_quantity = validated_data.get('quantity', quantity)
+            if (order.pk, new_product_id) != (order_id, product_id):
+                release_quantities(order_id, [(product_id, quantity)])
+                reserve_stock(order, [(new_product_id, new_quantity)])
+            elif new_quantity > quantity:
+                reserve_stock(order, [(product_id, new_quantity - quantity)])
+            elif new_quantity < quantity:
+                release_quantities(order_id, [(product_id, quantity - new_quantity)])
+            return super().update(instance, validated_data)
+
+class OrderSerializer(ValuesRepresentationMixin, SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'customer': ('CustomerSerializer', {}),
+        'payments': ('PaymentSerializer', {'many': True}),
+        'shipments': ('ShipmentSerializer', {'many': True}),
+    }
+    prefetch_related_fields = (
+        'items',
+        Prefetch('payments', queryset=Payment.objects.only('id', 'order')),
+        Prefetch('shipments', queryset=Shipment.objects.only('id', 'order')),
+    )
     customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
     items = OrderItemSerializer(many=True, read_only=True)
     payments = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
@@ -53,16 +433,72 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = '__all__'
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {'order': ('OrderSerializer', {})}
     order = serializers.PrimaryKeyRelatedField(queryset=Order.objects.all())
 
     class Meta:
         model = Payment
         fields = '__all__'
 
-class ShipmentSerializer(serializers.ModelSerializer):
+    # A completed payment commits the order's stock reservations (signals.py)
+    # and is rolled back with them when they have already expired
+    def create(self, validated_data):
+        with transaction.atomic():
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            return super().update(instance, validated_data)
+
+class ShipmentSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    expandable_fields = {'order': ('OrderSerializer', {})}
     order = serializers.PrimaryKeyRelatedField(queryset=Order.objects.all())
 
     class Meta:
         model = Shipment
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+# Checkout: the whole cart in one request and one transaction
+class CheckoutItemSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1)
+
+class CheckoutPaymentSerializer(serializers.Serializer):
+    payment_method = serializers.CharField(max_length=50)
+    transaction_id = serializers.CharField(max_length=100, required=False, allow_null=True)
+
+class CheckoutSerializer(serializers.Serializer):
+    customer = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
+    items = CheckoutItemSerializer(many=True, allow_empty=False)
+    payment = CheckoutPaymentSerializer()
+
+    def validate_items(self, items):
+        # One IN query for every product in the cart
+        ids = {item['product'] for item in items}
+        products = Product.objects.filter(pk__in=ids, is_active=True).only('id', 'price').in_bulk()
+        missing = sorted(ids - products.keys())
+        if missing:
+            raise serializers.ValidationError(f"Unknown or inactive products: {missing}")
+        for item in items:
+            item['product'] = products[item['product']]
+        return items
+
+    def create(self, validated_data):
+        lines = validated_data['items']
+        total = sum(line['product'].price * line['quantity'] for line in lines)
+        with transaction.atomic():
+            order = Order.objects.create(customer=validated_data['customer'], total_amount=total)
+            reserve_stock(order, [(line['product'].pk, line['quantity']) for line in lines])
+            items = OrderItem.objects.bulk_create(
+                OrderItem(order=order, product=line['product'], quantity=line['quantity'], unit_price=line['product'].price)
+                for line in lines
+            )
+            # bulk_create skips the OrderItem signals that maintain the rollups
+            rollups.add_items(items, order.created_at)
+            Payment.objects.create(order=order, amount=total, **validated_data['payment'])
+        return order
+
+    def to_representation(self, instance):
+        return OrderSerializer(instance, context=self.context).data
+
@@ -0,0 +1,148 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from . import autocomplete, carts, catalog_cache, inventory, rollups
+from .models import CartItem, Category, Order, OrderItem, Payment, Product
+
+
+# Sales rollups
+@receiver(pre_save, sender=Order)
+def capture_previous_order(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._rollup_previous = rollups.stored_order_snapshot(instance.pk)
+
+@receiver(post_save, sender=Order)
+def update_order_rollups(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop('_rollup_previous', None)
+    current = rollups.order_snapshot(instance)
+    if previous == current:
+        return
+    if previous:
+        rollups.remove_order(previous)
+    rollups.add_order(current)
+
+@receiver(post_delete, sender=Order)
+def remove_order_rollups(sender, instance, **kwargs):
+    rollups.remove_order(rollups.order_snapshot(instance))
+
+@receiver(pre_save, sender=OrderItem)
+def capture_previous_order_item(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._rollup_previous = rollups.stored_item_snapshot(instance.pk)
+
+@receiver(post_save, sender=OrderItem)
+def update_order_item_rollups(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop('_rollup_previous', None)
+    current = rollups.item_snapshot(instance)
+    if previous == current:
+        return
+    if previous:
+        rollups.remove_item(previous)
+    rollups.add_item(current)
+
+@receiver(pre_delete, sender=OrderItem)
+def capture_deleted_order_item(sender, instance, **kwargs):
+    # The parent order may be gone by post_delete when the delete cascades
+    instance._rollup_previous = rollups.item_snapshot(instance)
+
+@receiver(post_delete, sender=OrderItem)
+def remove_order_item_rollups(sender, instance, **kwargs):
+    previous = instance.__dict__.pop('_rollup_previous', None)
+    if previous:
+        rollups.remove_item(previous)
+
+
+# Cart totals
+@receiver(pre_save, sender=CartItem)
+def capture_previous_cart_item(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._cart_previous = carts.stored_line_snapshot(instance.pk)
+
+@receiver(post_save, sender=CartItem)
+def update_cart_total(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop('_cart_previous', None)
+    current = carts.line_snapshot(instance)
+    if previous == current:
+        return
+    if previous:
+        carts.remove_line(previous)
+    carts.add_line(current)
+
+@receiver(post_delete, sender=CartItem)
+def remove_from_cart_total(sender, instance, **kwargs):
+    # Runs before the product row goes when a product delete cascades
+    carts.remove_line(carts.line_snapshot(instance))
+
+@receiver(pre_save, sender=Product)
+def capture_previous_price(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._cart_previous_price = Product.objects.filter(pk=instance.pk).values_list('price', flat=True).first()
+
+@receiver(post_save, sender=Product)
+def reprice_carts(sender, instance, raw=False, **kwargs):
+    previous = instance.__dict__.pop('_cart_previous_price', None)
+    if raw or previous is None:
+        return
+    carts.reprice({instance.pk: Product._meta.get_field('price').to_python(instance.price) - previous})
+
+
+# Stock reservations
+@receiver(post_save, sender=Order)
+def release_cancelled_order_stock(sender, instance, raw=False, **kwargs):
+    if not raw and instance.status == 'Cancelled':
+        inventory.release_reservations(instance)
+
+@receiver(post_delete, sender=OrderItem)
+def release_deleted_item_stock(sender, instance, **kwargs):
+    # Also covers the bulk DELETE on /order-items/, which deletes through a queryset
+    inventory.release_quantities(instance.order_id, [(instance.product_id, instance.quantity)])
+
+@receiver(post_save, sender=Payment)
+def commit_paid_order_stock(sender, instance, raw=False, **kwargs):
+    if not raw and instance.status == 'Completed':
+        inventory.commit_reservations(instance.order)
+
+
+# Catalog cache
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_cached_product(sender, instance, **kwargs):
+    catalog_cache.invalidate_products([instance.pk])
+
+@receiver(post_save, sender=Category)
+def invalidate_cached_categories(sender, instance, **kwargs):
+    catalog_cache.invalidate_categories()
+
+@receiver(post_delete, sender=Category)
+def invalidate_cached_catalog(sender, instance, **kwargs):
+    catalog_cache.invalidate_catalog()
+
+@receiver(pre_delete, sender=Category)
+def touch_uncategorised_products(sender, instance, **kwargs):
+    # SET_NULL rewrites product.category without saving the products, which
+    # would leave their updated_at-based validators unchanged
+    Product.objects.filter(category=instance).update(updated_at=now())
+
+
+# Autocomplete index
+@receiver(post_save, sender=Product)
+def update_autocomplete_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: autocomplete.index.update(instance))
+
+@receiver(post_delete, sender=Product)
+def remove_from_autocomplete_index(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: autocomplete.index.remove(pk))
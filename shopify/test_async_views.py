@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from shopify.views import ProductListCreateView
+from shopify.models import Customer, Category, Product, Order, OrderItem
+
+
+def async_get(url, data=None, **extra):
+    return async_to_sync(AsyncClient().get)(url, data, **extra)
+
+@pytest.mark.django_db
+def test_async_product_and_category_lists_match_sync_views():
+    category = Category.objects.create(name='Stationery', slug='stationery')
+    for i in range(3):
+        Product.objects.create(name=f'Pen {i}', price='1.50', sku=str(uuid.uuid4()), category=category)
+
+    sync = Client().get(reverse('product-list-create'), {'page_size': 2}).json()
+    response = async_get(reverse('async-product-list'), {'page_size': 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['results'] == sync['results']
+    assert body['next'].startswith('http://testserver/async/products/?cursor=')
+    assert len(async_get(body['next']).json()['results']) == 1
+
+    assert async_get(reverse('async-product-list'), {'fields': 'id,name'}).json()['results'][0].keys() == {'id', 'name'}
+    expanded = async_get(reverse('async-product-list'), {'expand': 'category'}).json()
+    assert expanded['results'][0]['category']['slug'] == 'stationery'
+
+    assert async_get(reverse('async-category-list')).json() == Client().get(reverse('category-list-create')).json()
+    assert async_get(reverse('async-product-list'), {'cursor': 'bogus'}).status_code == 404
+
+@pytest.mark.django_db
+def test_async_product_detail_and_analytics_match_sync_views():
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    product = Product.objects.create(name='Pen', price='1.50', sku=str(uuid.uuid4()))
+    order = Order.objects.create(customer=customer, total_amount='3.00')
+    OrderItem.objects.create(order=order, product=product, quantity=2, unit_price='1.50')
+
+    url = reverse('async-product-detail', kwargs={'pk': product.pk})
+    assert async_get(url).json() == Client().get(reverse('product-detail', kwargs={'pk': product.pk})).json()
+    missing = async_get(reverse('async-product-detail', kwargs={'pk': product.pk + 1}))
+    assert missing.status_code == 404
+
+    analytics = async_get(reverse('async-sales-analytics'))
+    assert analytics.content == Client().get(reverse('sales-analytics')).content
+
+@pytest.mark.django_db
+def test_profiling_middleware_runs_in_async_mode(settings):
+    Product.objects.create(name='Pen', price='1.50', sku=str(uuid.uuid4()))
+    assert not async_get(reverse('async-product-list'), headers={'X-Profile': '1'}).has_header('Server-Timing')
+    settings.PROFILING_HEADER_PUBLIC = True
+    response = async_get(reverse('async-product-list'), headers={'X-Profile': '1'})
+    assert 'desc="1 queries"' in response['Server-Timing']
+
+@pytest.mark.django_db
+def test_async_views_apply_the_sync_view_policies(monkeypatch):
+    Product.objects.create(name='Pen', price='1.50', sku=str(uuid.uuid4()))
+    url = reverse('async-product-list')
+
+    monkeypatch.setattr(ProductListCreateView, 'renderer_classes', [JSONRenderer, BrowsableAPIRenderer])
+    assert async_get(url).content == Client().get(reverse('product-list-create')).content
+    browsable = async_get(url, headers={'Accept': 'text/html'})
+    assert browsable.status_code == 200 and browsable['Content-Type'].startswith('text/html')
+
+    monkeypatch.setattr(ProductListCreateView, 'permission_classes', [IsAdminUser])
+    response = async_get(url)
+    assert response.status_code == 403
+    assert response.json() == Client().get(reverse('product-list-create')).json()
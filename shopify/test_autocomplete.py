@@ -0,0 +1,81 @@
+import uuid
+
+import pytest
+from django.urls import reverse
+from django.test import Client
+from shopify import autocomplete
+from shopify.models import Product
+
+
+def names(client, prefix, **params):
+    response = client.get(reverse('product-autocomplete'), {'q': prefix, **params})
+    assert response.status_code == 200, response.content
+    return [row['name'] for row in response.json()]
+
+@pytest.mark.django_db
+def test_autocomplete_matches_name_words_and_sku():
+    client = Client()
+    Product.objects.create(name='Fountain Pen', price=1, sku='FP-001')
+    Product.objects.create(name='Pencil', price=1, sku='PC-002')
+    Product.objects.create(name='Pen refill', price=1, sku='RF-003', is_active=False)
+
+    assert names(client, 'pen') == ['Fountain Pen', 'Pencil']
+    assert names(client, 'FOUNT') == ['Fountain Pen']
+    assert names(client, 'pc-') == ['Pencil']
+    assert names(client, 'pen', limit=1) == ['Fountain Pen']
+    assert names(client, '') == []
+
+@pytest.mark.django_db
+def test_autocomplete_follows_product_writes(django_capture_on_commit_callbacks):
+    client = Client()
+    with django_capture_on_commit_callbacks(execute=True):
+        pen = Product.objects.create(name='Pen', price=1, sku=str(uuid.uuid4()))
+    assert names(client, 'pe') == ['Pen']
+
+    with django_capture_on_commit_callbacks(execute=True):
+        pen.name = 'Quill'
+        pen.save()
+        Product.objects.create(name='Peach', price=1, sku=str(uuid.uuid4()))
+    assert names(client, 'pe') == ['Peach']
+    assert names(client, 'qu') == ['Quill']
+
+    with django_capture_on_commit_callbacks(execute=True):
+        pen.is_active = False
+        pen.save()
+    assert names(client, 'qu') == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Product.objects.filter(name='Peach').delete()
+    assert names(client, 'pe') == []
+
+@pytest.mark.django_db
+def test_stale_index_keeps_serving_during_one_refresh(settings, monkeypatch):
+    client = Client()
+    Product.objects.create(name='Pen', price=1, sku=str(uuid.uuid4()))
+    assert names(client, 'pe') == ['Pen']
+
+    # A write from another process (no signals here) waits for the refresh
+    Product.objects.filter(name='Pen').update(name='Quill')
+    settings.AUTOCOMPLETE_REFRESH_SECONDS = 0
+    refreshes = []
+    monkeypatch.setattr(autocomplete.index, '_rebuild_in_background', lambda: refreshes.append(True))
+    assert names(client, 'pe') == ['Pen']
+    assert names(client, 'pe') == ['Pen']
+    assert refreshes == [True]
+
+    settings.AUTOCOMPLETE_REFRESH_SECONDS = 300
+    autocomplete.index._rebuild()
+    autocomplete.index._build_lock.release()
+    assert names(client, 'qu') == ['Quill']
+
+@pytest.mark.django_db
+def test_forked_worker_starts_with_a_fresh_index():
+    client = Client()
+    Product.objects.create(name='Pen', price=1, sku=str(uuid.uuid4()))
+    assert names(client, 'pe') == ['Pen']
+
+    # As if forked while the parent's background refresh held the build lock
+    autocomplete.index._build_lock.acquire()
+    autocomplete.index._after_fork()
+    Product.objects.filter(name='Pen').update(name='Quill')
+    assert names(client, 'qu') == ['Quill']
@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify.models import Customer, Product, Order
+
+
+@pytest.mark.django_db
+def test_products_by_ids_preserve_order_and_report_missing():
+    client = Client()
+    products = [Product.objects.create(name=f'Product {i}', price=1, sku=str(uuid.uuid4())) for i in range(3)]
+    ids = [products[2].id, 9999, products[0].id, products[2].id]
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse('product-list-create'), {'ids': ','.join(map(str, ids))})
+    assert response.status_code == 200, response.content
+    body = response.json()
+    assert [row['id'] for row in body['results']] == [products[2].id, products[0].id]
+    assert body['missing'] == [9999]
+    assert len(context.captured_queries) <= 2  # validator + IN query
+
+    assert client.get(reverse('product-list-create'), {'ids': 'a,b'}).status_code == 400
+    assert client.get(reverse('product-list-create'), {'ids': ','.join(['1'] * 101)}).status_code == 400
+
+@pytest.mark.django_db
+def test_orders_by_uuids():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    orders = [Order.objects.create(customer=customer, total_amount=1) for _ in range(2)]
+    unknown = uuid.uuid4()
+    response = client.get(reverse('order-list-create'), {'uuids': f'{orders[1].pk},{unknown}'})
+    body = response.json()
+    assert [row['uuid'] for row in body['results']] == [str(orders[1].pk)]
+    assert body['missing'] == [str(unknown)]
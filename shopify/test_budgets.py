@@ -0,0 +1,49 @@
+import uuid
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from shopify.conftest import ENDPOINT_BUDGETS
+from shopify.models import (
+    Customer, Cart, CartItem, Wishlist, Category, Product, Order, OrderItem, Payment, Shipment
+)
+
+
+def seed(count):
+    category = Category.objects.create(name=f'Category {uuid.uuid4()}', slug=str(uuid.uuid4()))
+    for _ in range(count):
+        customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+        product = Product.objects.create(name='Pen', price=1, stock=50, sku=str(uuid.uuid4()), category=category)
+        CartItem.objects.create(cart=Cart.objects.create(customer=customer), product=product)
+        Wishlist.objects.create(customer=customer).products.add(product)
+        order = Order.objects.create(customer=customer, total_amount=2)
+        OrderItem.objects.create(order=order, product=product, quantity=2, unit_price=1)
+        Payment.objects.create(order=order, amount=2, payment_method='Card')
+        Shipment.objects.create(order=order, tracking_number=str(uuid.uuid4()), carrier='DHL')
+    return product
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', sorted(name for name in ENDPOINT_BUDGETS if name != 'product-detail'))
+def test_list_endpoints_stay_within_budget(budget_client, name):
+    seed(2)
+    budget_client.get(reverse(name))
+    seed(10)
+    cache.clear()  # catalog invalidation runs on commit, which these tests never reach
+    budget_client.get(reverse(name))
+    few, many = budget_client.measurements
+    assert few['queries'] == many['queries']
+
+@pytest.mark.django_db
+def test_product_detail_within_budget(budget_client):
+    product = seed(1)
+    budget_client.get(reverse('product-detail', kwargs={'pk': product.pk}))
+
+@pytest.mark.django_db
+def test_exceeding_a_budget_fails_with_the_sql(budget_client):
+    seed(1)
+    with pytest.raises(pytest.fail.Exception) as failure:
+        with budget_client.budget(queries=1):
+            budget_client.get(reverse('order-list-create'))
+    message = str(failure.value)
+    assert 'ran 4 queries, budget is 1' in message
+    assert 'shopify_payment' in message
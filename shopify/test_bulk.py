@@ -0,0 +1,77 @@
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify.models import Customer, Category, Product, Order, OrderItem, DailyProductSales
+
+
+def post(client, url, payload):
+    return client.post(url, data=json.dumps(payload), content_type='application/json')
+
+def product_rows(count, category, price='9.99'):
+    return [
+        {'name': f'Product {i}', 'description': 'Bulk', 'price': price, 'stock': 10,
+         'sku': f'SKU-{i}', 'category': category.id}
+        for i in range(count)
+    ]
+
+@pytest.mark.django_db
+def test_product_bulk_upsert_by_sku():
+    client = Client()
+    category = Category.objects.create(name='Stationery', slug='stationery')
+    url = reverse('product-list-create')
+
+    with CaptureQueriesContext(connection) as small:
+        assert post(client, url, product_rows(2, category)).status_code == 201
+    with CaptureQueriesContext(connection) as large:
+        response = post(client, url, product_rows(50, category, price='5.00'))
+    assert response.status_code == 201, response.content
+    assert len(large.captured_queries) <= len(small.captured_queries) + 2
+
+    assert Product.objects.count() == 50
+    assert Product.objects.get(sku='SKU-1').price == Decimal('5.00')
+    assert len(response.json()) == 50
+
+@pytest.mark.django_db
+def test_product_bulk_rejects_bad_rows():
+    client = Client()
+    category = Category.objects.create(name='Stationery', slug='stationery')
+    rows = product_rows(2, category)
+    rows[1]['category'] = category.id + 100
+    assert post(client, reverse('product-list-create'), rows).status_code == 400
+
+    rows = product_rows(4, category)
+    rows[1]['sku'] = rows[3]['sku'] = rows[0]['sku']
+    response = post(client, reverse('product-list-create'), rows)
+    assert response.status_code == 400
+    assert "['SKU-0']" in response.content.decode()
+    assert not Product.objects.exists()
+
+@pytest.mark.django_db
+def test_order_item_bulk_create_and_delete():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    orders = [Order.objects.create(customer=customer, total_amount=0) for _ in range(2)]
+    product = Product.objects.create(name='Pen', price=1, stock=10, sku=str(uuid.uuid4()))
+    rows = [
+        {'order': str(order.pk), 'product': product.id, 'quantity': 2, 'unit_price': '1.00'}
+        for order in orders for _ in range(2)
+    ]
+
+    response = post(client, reverse('order-item-list-create'), rows)
+    assert response.status_code == 201, response.content
+    assert OrderItem.objects.count() == 4
+    product.refresh_from_db()
+    assert product.stock == 2
+    assert DailyProductSales.objects.get(product=product).quantity == 8
+
+    ids = [row['id'] for row in response.json()[:3]]
+    response = client.delete(reverse('order-item-list-create'), data=json.dumps(ids), content_type='application/json')
+    assert response.json() == {'deleted': 3}
+    assert OrderItem.objects.count() == 1
+    assert DailyProductSales.objects.get(product=product).quantity == 2
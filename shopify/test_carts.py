@@ -0,0 +1,71 @@
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from shopify.carts import reconcile
+from shopify.models import Customer, Cart, CartItem, Product
+
+
+def create_cart():
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    return Cart.objects.create(customer=customer)
+
+def total(cart):
+    cart.refresh_from_db()
+    return cart.total_amount
+
+@pytest.mark.django_db
+def test_cart_item_endpoints_keep_total_in_step():
+    client = Client()
+    cart = create_cart()
+    pen = Product.objects.create(name='Pen', price='1.50', sku=str(uuid.uuid4()))
+    ink = Product.objects.create(name='Ink', price='4.00', sku=str(uuid.uuid4()))
+
+    def post(product, quantity):
+        response = client.post(reverse('cart-item-list-create'), data=json.dumps(
+            {'cart': cart.pk, 'product': product.pk, 'quantity': quantity}), content_type='application/json')
+        assert response.status_code == 201, response.content
+        return response.json()['id']
+
+    pen_line = post(pen, 2)
+    post(ink, 1)
+    assert total(cart) == Decimal('7.00')
+
+    url = reverse('cart-item-detail', kwargs={'pk': pen_line})
+    response = client.patch(url, data=json.dumps({'quantity': 5}), content_type='application/json')
+    assert response.status_code == 200, response.content
+    assert total(cart) == Decimal('11.50')
+
+    pen.price = Decimal('2.00')
+    pen.save()
+    assert total(cart) == Decimal('14.00')
+
+    assert client.delete(url).status_code == 204
+    assert total(cart) == Decimal('4.00')
+    body = client.get(reverse('cart-item-list-create'), {'cart_id': cart.pk}).json()
+    assert [row['product'] for row in body['results']] == [ink.pk]
+
+    # Clients cannot overwrite the maintained total
+    response = client.post(reverse('cart-list-create'), data=json.dumps(
+        {'customer': cart.customer_id, 'total_amount': '99.00'}), content_type='application/json')
+    assert response.json()['total_amount'] == '0.00'
+
+@pytest.mark.django_db
+def test_reconcile_reports_and_fixes_drift(capsys):
+    carts = [create_cart() for _ in range(3)]
+    pen = Product.objects.create(name='Pen', price='1.50', sku=str(uuid.uuid4()))
+    for cart in carts:
+        CartItem.objects.create(cart=cart, product=pen, quantity=2)
+    # Queryset updates bypass the signals
+    Cart.objects.filter(pk=carts[0].pk).update(total_amount=10)
+    CartItem.objects.filter(cart=carts[1]).update(quantity=4)
+
+    assert sorted(pk for pk, _, _ in reconcile(fix=False)) == [carts[0].pk, carts[1].pk]
+    call_command('reconcile_cart_totals')
+    assert 'Fixed 2 drifted carts, total drift $10.00' in capsys.readouterr().out
+    assert [total(cart) for cart in carts] == [Decimal('3.00'), Decimal('6.00'), Decimal('3.00')]
+    assert reconcile() == []
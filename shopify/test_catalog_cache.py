@@ -0,0 +1,130 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify.inventory import reserve_stock
+from shopify.models import Customer, Category, Product, Order
+
+
+def get(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    return response.json(), len(context.captured_queries)
+
+@pytest.mark.django_db
+def test_product_list_is_cached_until_a_product_changes(django_capture_on_commit_callbacks, staff_client):
+    client = Client()
+    url = reverse('product-list-create')
+    with django_capture_on_commit_callbacks(execute=True):
+        product = Product.objects.create(name='Pen', price=1, stock=5, sku=str(uuid.uuid4()))
+
+    first, queries = get(client, url)
+    assert queries > 0
+    again, queries = get(client, url)
+    assert queries == 0
+    assert again == first
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.name = 'Fountain Pen'
+        product.save()
+    body, queries = get(client, url)
+    assert queries > 0
+    assert body['results'][0]['name'] == 'Fountain Pen'
+
+    stats = staff_client.get(reverse('catalog-cache-stats')).json()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+@pytest.mark.django_db
+def test_product_detail_invalidation_is_per_product(django_capture_on_commit_callbacks):
+    client = Client()
+    with django_capture_on_commit_callbacks(execute=True):
+        pen = Product.objects.create(name='Pen', price=1, stock=5, sku=str(uuid.uuid4()))
+        ink = Product.objects.create(name='Ink', price=1, stock=5, sku=str(uuid.uuid4()))
+        customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+        order = Order.objects.create(customer=customer, total_amount=1)
+    pen_url = reverse('product-detail', kwargs={'pk': pen.pk})
+    ink_url = reverse('product-detail', kwargs={'pk': ink.pk})
+    get(client, pen_url)
+    get(client, ink_url)
+
+    # Stock moves through a queryset UPDATE, which must still invalidate
+    with django_capture_on_commit_callbacks(execute=True):
+        reserve_stock(order, [(pen.pk, 2)])
+    body, queries = get(client, pen_url)
+    assert queries > 0 and body['stock'] == 3
+    _, queries = get(client, ink_url)
+    assert queries == 0
+
+@pytest.mark.django_db
+def test_category_delete_refreshes_product_pages(django_capture_on_commit_callbacks):
+    client = Client()
+    with django_capture_on_commit_callbacks(execute=True):
+        category = Category.objects.create(name='Stationery', slug='stationery')
+        pen = Product.objects.create(name='Pen', price=1, sku=str(uuid.uuid4()), category=category)
+    url = reverse('product-detail', kwargs={'pk': pen.pk})
+    assert get(client, url)[0]['category'] == category.pk
+    assert len(get(client, reverse('category-list-create'))[0]['results']) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        category.delete()
+    assert get(client, url)[0]['category'] is None
+    assert get(client, reverse('category-list-create'))[0]['results'] == []
+
+@pytest.mark.django_db
+def test_conditional_get_returns_304_until_rows_change():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    url = reverse('customer-list-create')
+
+    response = client.get(url)
+    etag = response['ETag']
+    assert response.status_code == 200 and response.has_header('Last-Modified')
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert len(context.captured_queries) == 1
+
+    customer.name = 'Renamed'
+    customer.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    etag = client.get(url)['ETag']
+    customer.delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+@pytest.mark.django_db
+def test_cached_product_list_answers_304_without_queries(django_capture_on_commit_callbacks):
+    client = Client()
+    with django_capture_on_commit_callbacks(execute=True):
+        product = Product.objects.create(name='Pen', price=1, stock=5, sku=str(uuid.uuid4()))
+    url = reverse('product-detail', kwargs={'pk': product.pk})
+    etag = client.get(url)['ETag']
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert len(context.captured_queries) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.stock = 4
+        product.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+@pytest.mark.django_db
+def test_cached_pages_link_to_the_requesting_host(django_capture_on_commit_callbacks):
+    client = Client()
+    with django_capture_on_commit_callbacks(execute=True):
+        for name in ('Pen', 'Ink'):
+            Product.objects.create(name=name, price=1, stock=5, sku=str(uuid.uuid4()))
+    url = reverse('product-list-create')
+
+    first = client.get(url, {'page_size': 1}).json()
+    assert first['next'].startswith('http://testserver/')
+    internal = client.get(url, {'page_size': 1}, headers={'host': 'localhost'}).json()
+    assert internal['next'].startswith('http://localhost/')
+    secure = client.get(url, {'page_size': 1}, secure=True).json()
+    assert secure['next'].startswith('https://testserver/')
@@ -0,0 +1,61 @@
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.test import Client
+from shopify.models import Customer, Product, Order, DailyProductSales, StockReservation
+
+
+def checkout(client, payload):
+    return client.post(reverse('checkout'), data=json.dumps(payload), content_type='application/json')
+
+@pytest.mark.django_db
+def test_checkout_creates_order_items_and_payment():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    pen = Product.objects.create(name='Pen', price=Decimal('2.50'), stock=10, sku=str(uuid.uuid4()))
+    ink = Product.objects.create(name='Ink', price=Decimal('7.00'), stock=3, sku=str(uuid.uuid4()))
+
+    response = checkout(client, {
+        'customer': customer.id,
+        'items': [{'product': pen.id, 'quantity': 4}, {'product': ink.id, 'quantity': 1}],
+        'payment': {'payment_method': 'Credit Card'},
+    })
+    assert response.status_code == 201, response.content
+    body = response.json()
+
+    order = Order.objects.get(uuid=body['uuid'])
+    assert order.total_amount == Decimal('17.00')
+    assert sorted((i.product_id, i.quantity, i.unit_price) for i in order.items.all()) == [
+        (pen.id, 4, Decimal('2.50')), (ink.id, 1, Decimal('7.00')),
+    ]
+    assert order.payments.get().amount == Decimal('17.00')
+    assert len(body['items']) == 2 and len(body['payments']) == 1
+
+    pen.refresh_from_db()
+    assert pen.stock == 6
+    assert set(StockReservation.objects.values_list('status', flat=True)) == {StockReservation.COMMITTED}
+    assert DailyProductSales.objects.get(product=pen).quantity == 4
+
+@pytest.mark.django_db
+def test_checkout_rolls_back_when_stock_is_short():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    pen = Product.objects.create(name='Pen', price=1, stock=1, sku=str(uuid.uuid4()))
+
+    response = checkout(client, {
+        'customer': customer.id,
+        'items': [{'product': pen.id, 'quantity': 2}],
+        'payment': {'payment_method': 'Credit Card'},
+    })
+    assert response.status_code == 409
+    assert not Order.objects.exists()
+
+    response = checkout(client, {
+        'customer': customer.id,
+        'items': [{'product': pen.id + 1000, 'quantity': 1}],
+        'payment': {'payment_method': 'Credit Card'},
+    })
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+import importlib
+
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+
+import Ecommerce.settings
+
+
+@pytest.fixture
+def reload_settings(monkeypatch):
+    for name in ('DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST', 'DB_PORT'):
+        monkeypatch.setenv(name, 'shop')
+    yield lambda: importlib.reload(Ecommerce.settings).DATABASES['default']
+    monkeypatch.undo()
+    importlib.reload(Ecommerce.settings)
+
+def test_pool_settings_come_from_the_environment(reload_settings, monkeypatch):
+    monkeypatch.setenv('DB_CONN_MAX_AGE', '30')
+    database = reload_settings()
+    assert database['CONN_MAX_AGE'] == 30 and database['CONN_HEALTH_CHECKS'] is True
+    assert 'pool' not in database['OPTIONS']
+
+    # Async requests would leave a persistent connection behind in each thread
+    monkeypatch.setenv('SERVER_INTERFACE', 'asgi')
+    assert reload_settings()['CONN_MAX_AGE'] == 0
+    monkeypatch.delenv('SERVER_INTERFACE')
+
+    # Django refuses persistent connections together with a pool
+    monkeypatch.setenv('DB_POOL', 'True')
+    monkeypatch.setenv('DB_POOL_MAX_SIZE', '20')
+    database = reload_settings()
+    assert database['CONN_MAX_AGE'] == 0
+    assert database['OPTIONS']['pool']['max_size'] == 20
+
+@pytest.mark.django_db
+def test_database_stats_count_new_connections(staff_client):
+    client = staff_client
+    before = client.get(reverse('db-pool-stats')).json()['default']
+    assert before['vendor'] == connection.vendor and before['pooled'] is False
+
+    connection_created.send(sender=connection.__class__, connection=connection)
+    after = client.get(reverse('db-pool-stats')).json()['default']
+    assert after['connects'] == before['connects'] + 1
@@ -0,0 +1,53 @@
+import uuid
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify.models import Customer, Product, Order, OrderItem, Payment, Shipment, Wishlist
+
+
+def create_orders(count):
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    product = Product.objects.create(name='Test Product', price=10.0, stock=5, sku=str(uuid.uuid4()))
+    for _ in range(count):
+        order = Order.objects.create(customer=customer, total_amount=20.0)
+        OrderItem.objects.create(order=order, product=product, quantity=2, unit_price=10.0)
+        Payment.objects.create(order=order, amount=20.0, payment_method='Credit Card')
+        Shipment.objects.create(order=order, tracking_number=str(uuid.uuid4()), carrier='DHL')
+
+def count_queries(url):
+    client = Client()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, response.content
+    return len(context.captured_queries), response.json()
+
+@pytest.mark.django_db
+def test_order_list_query_count_is_independent_of_row_count():
+    create_orders(2)
+    few_queries, few = count_queries(reverse('order-list-create'))
+    create_orders(8)
+    many_queries, many = count_queries(reverse('order-list-create'))
+
+    assert len(few['results']) == 2
+    assert len(many['results']) == 10
+    assert few_queries == many_queries == 4
+    order = many['results'][0]
+    assert len(order['items']) == 1
+    assert len(order['payments']) == 1
+    assert len(order['shipments']) == 1
+
+@pytest.mark.django_db
+def test_wishlist_list_prefetches_products():
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    products = [
+        Product.objects.create(name=f'Product {i}', price=10.0, sku=str(uuid.uuid4()))
+        for i in range(3)
+    ]
+    for _ in range(5):
+        Wishlist.objects.create(customer=customer).products.set(products)
+
+    queries, body = count_queries(reverse('wishlist-list-create'))
+    assert queries == 2
+    assert sorted(body['results'][0]['products']) == sorted(p.id for p in products)
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.test import AsyncClient, Client
+from shopify import exports
+from shopify.models import Customer, Product, Order, OrderItem
+
+
+@pytest.mark.django_db
+def test_order_export_streams_csv_and_ndjson():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    product = Product.objects.create(name='Pen', price=1, sku=str(uuid.uuid4()))
+    pending = Order.objects.create(customer=customer, total_amount=10)
+    shipped = Order.objects.create(customer=customer, total_amount=20, status='Shipped')
+    OrderItem.objects.create(order=shipped, product=product, quantity=3, unit_price=1)
+    Order.objects.filter(pk=pending.pk).update(created_at='2025-01-01T00:00:00Z')
+
+    response = client.get(reverse('order-export'))
+    assert response.streaming
+    rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+    assert [row['uuid'] for row in rows] == [str(pending.pk), str(shipped.pk)]
+
+    response = client.get(reverse('order-export'), {'export_format': 'ndjson', 'start': '2025-06-01'})
+    lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+    assert [line['uuid'] for line in lines] == [str(shipped.pk)]
+    assert lines[0]['total_amount'] == '20.00'
+
+    response = client.get(reverse('order-item-export'), {'export_format': 'ndjson', 'status': 'Shipped'})
+    lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+    assert [(line['order_id'], line['quantity']) for line in lines] == [(str(shipped.pk), 3)]
+
+    assert client.get(reverse('order-export'), {'export_format': 'xml'}).status_code == 400
+
+@pytest.mark.django_db
+def test_export_streams_asynchronously_under_asgi(monkeypatch):
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    orders = [Order.objects.create(customer=customer, total_amount=i) for i in range(5)]
+    monkeypatch.setattr(exports, 'CHUNK_SIZE', 2)
+
+    async def fetch():
+        response = await AsyncClient().get(reverse('order-export'), {'export_format': 'ndjson'})
+        assert response.is_async
+        return [chunk async for chunk in response.streaming_content]
+
+    chunks = async_to_sync(fetch)()
+    assert len(chunks) == 3
+    lines = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+    assert sorted(line['uuid'] for line in lines) == sorted(str(order.pk) for order in orders)
@@ -0,0 +1,182 @@
+import json
+import threading
+import uuid
+
+import pytest
+from django.db import OperationalError, connection
+from django.urls import reverse
+from django.test import Client
+from django.utils.timezone import timedelta
+from shopify.inventory import (
+    InsufficientStock, ReservationExpired, reserve_stock, release_reservations, release_expired_reservations
+)
+from shopify.models import Customer, Product, Order, OrderItem, Payment, StockReservation
+from shopify.serializers import OrderItemSerializer
+
+
+def create_order():
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    return Order.objects.create(customer=customer, total_amount=0)
+
+def create_product(stock):
+    return Product.objects.create(name='Test Product', price=10, stock=stock, sku=str(uuid.uuid4()))
+
+@pytest.mark.django_db
+def test_reservation_is_all_or_nothing():
+    order = create_order()
+    pen, ink = create_product(5), create_product(1)
+
+    with pytest.raises(InsufficientStock) as excinfo:
+        reserve_stock(order, [(pen.pk, 2), (ink.pk, 2)])
+    assert excinfo.value.product_ids == [ink.pk]
+
+    pen.refresh_from_db()
+    ink.refresh_from_db()
+    assert (pen.stock, ink.stock) == (5, 1)
+    assert not StockReservation.objects.exists()
+
+    reserve_stock(order, [(pen.pk, 2), (ink.pk, 1), (pen.pk, 1)])
+    pen.refresh_from_db()
+    ink.refresh_from_db()
+    assert (pen.stock, ink.stock) == (2, 0)
+    assert StockReservation.objects.get(product=pen).quantity == 3
+
+@pytest.mark.django_db
+def test_cancel_and_expiry_return_stock_once():
+    product = create_product(10)
+    cancelled, abandoned, paid = create_order(), create_order(), create_order()
+    reserve_stock(cancelled, [(product.pk, 1)])
+    reserve_stock(abandoned, [(product.pk, 2)], ttl=timedelta(seconds=-1))
+    reserve_stock(paid, [(product.pk, 4)], ttl=timedelta(seconds=-1))
+    Payment.objects.create(order=paid, amount=40, payment_method='Credit Card')
+
+    cancelled.status = 'Cancelled'
+    cancelled.save()
+    assert release_reservations(cancelled) == 0
+    assert release_expired_reservations() == 1
+    assert release_expired_reservations() == 0
+
+    product.refresh_from_db()
+    assert product.stock == 6
+
+@pytest.mark.django_db
+def test_order_item_create_reserves_stock():
+    client = Client()
+    order = create_order()
+    product = create_product(2)
+    payload = {'order': str(order.pk), 'product': product.pk, 'quantity': 2, 'unit_price': 10}
+
+    response = client.post(reverse('order-item-list-create'), data=json.dumps(payload), content_type='application/json')
+    assert response.status_code == 201, response.content
+    response = client.post(reverse('order-item-list-create'), data=json.dumps(payload), content_type='application/json')
+    assert response.status_code == 409
+    assert order.items.count() == 1
+
+    product.refresh_from_db()
+    assert product.stock == 0
+
+@pytest.mark.django_db(transaction=True)
+def test_hot_sku_is_never_oversold():
+    product = create_product(25)
+    orders = [create_order() for _ in range(40)]
+    outcomes = []
+    start = threading.Barrier(len(orders))
+
+    def checkout(order):
+        try:
+            start.wait()
+            for attempt in range(20):
+                try:
+                    reserve_stock(order, [(product.pk, 1)])
+                    outcomes.append(True)
+                    return
+                except InsufficientStock:
+                    outcomes.append(False)
+                    return
+                except OperationalError:
+                    # SQLite reports writer contention as "database is locked"
+                    if connection.vendor != 'sqlite' or attempt == 19:
+                        raise
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=checkout, args=(order,)) for order in orders]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    product.refresh_from_db()
+    assert outcomes.count(True) == 25
+    assert outcomes.count(False) == 15
+    assert product.stock == 0
+    assert StockReservation.objects.filter(product=product).count() == 25
+
+@pytest.mark.django_db
+def test_expired_order_cannot_be_paid():
+    client = Client()
+    product = create_product(5)
+    order = create_order()
+    reserve_stock(order, [(product.pk, 3)], ttl=timedelta(seconds=-1))
+    assert release_expired_reservations() == 1
+    order.refresh_from_db()
+    assert order.status == 'Expired'
+
+    payload = {'order': str(order.pk), 'amount': 30, 'payment_method': 'Credit Card'}
+    response = client.post(reverse('payment-list-create'), data=json.dumps(payload), content_type='application/json')
+    assert response.status_code == 409, response.content
+    assert response.json()['detail'] == ReservationExpired.default_detail
+    assert not Payment.objects.exists()
+
+    with pytest.raises(ReservationExpired):
+        Payment.objects.create(order=order, amount=30, payment_method='Credit Card')
+    product.refresh_from_db()
+    assert product.stock == 5
+    assert not StockReservation.objects.filter(status=StockReservation.COMMITTED).exists()
+
+@pytest.mark.django_db
+def test_order_item_updates_reserve_only_the_change():
+    order = create_order()
+    pen, ink = create_product(5), create_product(5)
+    serializer = OrderItemSerializer(data={'order': order.pk, 'product': pen.pk, 'quantity': 2, 'unit_price': 10})
+    serializer.is_valid(raise_exception=True)
+    item = serializer.save()
+
+    def update(**changes):
+        serializer = OrderItemSerializer(OrderItem.objects.get(pk=item.pk), data=changes, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def stock():
+        return [Product.objects.get(pk=product.pk).stock for product in (pen, ink)]
+
+    with pytest.raises(InsufficientStock):
+        update(quantity=6)
+    assert stock() == [3, 5]
+    update(quantity=4)
+    assert stock() == [1, 5]
+    update(quantity=1)
+    assert stock() == [4, 5]
+    update(product=ink.pk, quantity=3)
+    assert stock() == [5, 2]
+    held = StockReservation.objects.filter(order=order, status=StockReservation.RESERVED)
+    assert list(held.values_list('product_id', 'quantity')) == [(ink.pk, 3)]
+
+@pytest.mark.django_db
+def test_deleting_order_items_returns_their_stock():
+    client = Client()
+    order = create_order()
+    product = create_product(10)
+    rows = [{'order': str(order.pk), 'product': product.pk, 'quantity': 2, 'unit_price': 10} for _ in range(3)]
+    response = client.post(reverse('order-item-list-create'), data=json.dumps(rows), content_type='application/json')
+    ids = [row['id'] for row in response.json()]
+    product.refresh_from_db()
+    assert product.stock == 4
+
+    OrderItem.objects.get(pk=ids[0]).delete()
+    product.refresh_from_db()
+    assert product.stock == 6
+    client.delete(reverse('order-item-list-create'), data=json.dumps(ids[1:]), content_type='application/json')
+    product.refresh_from_db()
+    assert product.stock == 10
+    assert not StockReservation.objects.filter(status=StockReservation.RESERVED).exists()
@@ -0,0 +1,51 @@
+import json
+import uuid
+
+import pytest
+from django.core.management import call_command
+from django.test import Client, override_settings
+from django.urls import reverse
+from shopify.loadtest import ClientTarget, load_entries, percentile, replay, summarize
+from shopify.models import Customer
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recorded_traffic_replays_with_per_url_stats(tmp_path):
+    path = tmp_path / 'requests.jsonl'
+    with override_settings(REQUEST_RECORD_FILE=str(path)):
+        client = Client()
+        client.get(reverse('customer-list-create'))
+        client.post(
+            reverse('customer-list-create'),
+            data=json.dumps({'name': 'Test User', 'email': f'test_{uuid.uuid4()}@example.com'}),
+            content_type='application/json',
+        )
+        client.get(reverse('product-list-create'), {'page_size': 5})
+    with path.open('a') as log:
+        log.write('{"request_id": "not-a-request"}\n')
+
+    entries, skipped = load_entries(path)
+    assert [entry['method'] for entry in entries] == ['GET', 'POST', 'GET']
+    assert entries[2]['path'].endswith('?page_size=5')
+    assert skipped == 1
+
+    reads = [entry for entry in entries if entry['method'] == 'GET']
+    results, elapsed = replay(reads, ClientTarget(), concurrency=2, repeat=3)
+    rows = {row['url_name']: row for row in summarize(results, elapsed)}
+    assert rows['customer-list-create']['requests'] == 3
+    assert rows['<all>']['requests'] == 6 and rows['<all>']['errors'] == 0
+    assert rows['customer-list-create']['max_queries'] >= 1
+    assert Customer.objects.count() == 1
+
+def test_nearest_rank_percentiles():
+    values = list(range(1, 101))
+    assert (percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0.99)) == (50, 95, 99)
+    assert percentile([7], 0.99) == 7
+
+@pytest.mark.django_db(transaction=True)
+def test_replay_command_reports_json(tmp_path, capsys):
+    path = tmp_path / 'requests.jsonl'
+    path.write_text(json.dumps({'method': 'GET', 'path': reverse('category-list-create')}) + '\n')
+    call_command('loadtest', 'replay', str(path), '--json')
+    rows = json.loads(capsys.readouterr().out)
+    assert [row['url_name'] for row in rows] == ['category-list-create', '<all>']
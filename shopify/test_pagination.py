@@ -0,0 +1,83 @@
+import uuid
+import pytest
+from django.urls import reverse
+from django.test import Client
+from shopify.models import Customer, Category, Order, Product
+
+
+def create_customers(count):
+    return [
+        Customer.objects.create(name=f"Customer {i}", email=f"test_{uuid.uuid4()}@example.com")
+        for i in range(count)
+    ]
+
+@pytest.mark.django_db
+def test_customer_list_walks_all_pages_without_duplicates():
+    client = Client()
+    customers = create_customers(7)
+    # Give several rows the same timestamp so the pk tie-breaker is exercised
+    Customer.objects.filter(pk__in=[c.pk for c in customers[:4]]).update(created_at=customers[0].created_at)
+
+    seen = []
+    url = reverse('customer-list-create') + '?page_size=3'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+        body = response.json()
+        assert len(body['results']) <= 3
+        seen.extend(row['id'] for row in body['results'])
+        url = body['next']
+
+    expected = list(Customer.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+    assert seen == expected
+
+@pytest.mark.django_db
+def test_previous_link_returns_to_prior_page():
+    client = Client()
+    create_customers(5)
+
+    first = client.get(reverse('customer-list-create') + '?page_size=2').json()
+    assert first['previous'] is None
+    second = client.get(first['next']).json()
+    back = client.get(second['previous']).json()
+
+    assert [row['id'] for row in back['results']] == [row['id'] for row in first['results']]
+
+@pytest.mark.django_db
+def test_models_without_timestamps_paginate_by_pk():
+    client = Client()
+    for i in range(3):
+        Category.objects.create(name=f"Category {i}", slug=f"category-{i}")
+
+    body = client.get(reverse('category-list-create') + '?page_size=2').json()
+    assert len(body['results']) == 2
+    assert body['next'] is not None
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_rejected():
+    client = Client()
+    response = client.get(reverse('customer-list-create') + '?cursor=not-a-cursor')
+    assert response.status_code == 404
+
+@pytest.mark.django_db
+def test_orders_filter_by_customer_id():
+    client = Client()
+    first, second = create_customers(2)
+    orders = [Order.objects.create(customer=customer, total_amount=1) for customer in (first, second, first)]
+
+    body = client.get(reverse('order-list-create'), {'customer_id': first.pk}).json()
+    assert [row['uuid'] for row in body['results']] == [str(orders[2].pk), str(orders[0].pk)]
+    assert client.get(reverse('order-list-create'), {'customer_id': str(uuid.uuid4())}).status_code == 400
+
+@pytest.mark.django_db
+def test_products_filter_by_category_lists_active_products():
+    client = Client()
+    pens, inks = (Category.objects.create(name=name, slug=name) for name in ('pens', 'inks'))
+    products = [
+        Product.objects.create(name='Item', price=1, sku=str(uuid.uuid4()), category=category, is_active=is_active)
+        for category, is_active in ((pens, True), (inks, True), (pens, False), (pens, True))
+    ]
+
+    body = client.get(reverse('product-list-create'), {'category': pens.pk}).json()
+    assert [row['id'] for row in body['results']] == [products[3].pk, products[0].pk]
+    assert client.get(reverse('product-list-create'), {'category': 'pens'}).status_code == 400
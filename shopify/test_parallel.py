@@ -0,0 +1,44 @@
+import threading
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify import parallel
+from shopify.models import Customer, Product, Order, OrderItem
+
+
+def create_sales():
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    product = Product.objects.create(name='Pen', price=1, stock=10, sku=str(uuid.uuid4()))
+    order = Order.objects.create(customer=customer, total_amount=6)
+    OrderItem.objects.create(order=order, product=product, quantity=3, unit_price=2)
+
+@pytest.mark.django_db(transaction=True)
+def test_fan_out_runs_queries_on_separate_threads():
+    create_sales()
+    threads = []
+
+    def query():
+        threads.append(threading.get_ident())
+        return Order.objects.count()
+
+    assert parallel.fan_out([query, query, query]) == [1, 1, 1]
+    assert threading.get_ident() not in threads
+
+    parallel_body = Client().get(reverse('sales-analytics')).json()
+    with override_settings(ANALYTICS_QUERY_WORKERS=1):
+        assert Client().get(reverse('sales-analytics')).json() == parallel_body
+    assert parallel_body['total_orders'] == 1 and parallel_body['monthly_sales'] == 6.0
+
+@pytest.mark.django_db
+def test_fan_out_stays_on_the_caller_inside_a_transaction():
+    create_sales()
+    # The test transaction's rows are invisible to other connections
+    with CaptureQueriesContext(connection) as context:
+        body = Client().get(reverse('sales-analytics')).json()
+    assert body['total_orders'] == 1
+    assert body['top_products'] == [{'product__name': 'Pen', 'total_quantity': 3}]
+    assert len(context.captured_queries) == 3
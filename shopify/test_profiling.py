@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+from django.test import Client, override_settings
+from django.urls import reverse
+from shopify.models import Customer, Product, Order, OrderItem
+
+
+def timings(response):
+    return {entry.split(';')[0]: entry for entry in response['Server-Timing'].split(', ')}
+
+@pytest.mark.django_db
+def test_profiled_request_reports_server_timing_and_histogram(staff_client):
+    client = staff_client
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    product = Product.objects.create(name='Pen', price=1, stock=5, sku=str(uuid.uuid4()))
+    order = Order.objects.create(customer=customer, total_amount=1)
+    OrderItem.objects.create(order=order, product=product, quantity=1, unit_price=1)
+
+    assert not client.get(reverse('order-list-create')).has_header('Server-Timing')
+
+    response = client.get(reverse('order-list-create'), HTTP_X_PROFILE='1')
+    parts = timings(response)
+    assert set(parts) == {'db', 'serializer', 'render', 'total'}
+    assert 'desc="4 queries"' in parts['db']
+
+    client.get(reverse('order-list-create'), {'expand': 'customer'}, HTTP_X_PROFILE='1')
+    stats = client.get(reverse('profiling-stats')).json()
+    orders = stats['order-list-create']
+    assert orders['requests'] == 2
+    assert sum(bucket['count'] for bucket in orders['histogram']) == 2
+    assert orders['avg_ms']['serializer'] > 0
+    assert 'customer-list-create' not in stats
+
+    assert client.delete(reverse('profiling-stats')).status_code == 204
+    assert client.get(reverse('profiling-stats')).json() == {}
+
+@pytest.mark.django_db
+@override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_HEADER='')
+def test_sampling_profiles_without_the_header():
+    response = Client().get(reverse('customer-list-create'))
+    assert 'desc="2 queries"' in timings(response)['db']
+
+@pytest.mark.django_db
+def test_profiling_is_staff_only():
+    client = Client()
+    assert not client.get(reverse('customer-list-create'), HTTP_X_PROFILE='1').has_header('Server-Timing')
+    assert client.get(reverse('profiling-stats')).status_code == 403
+    assert client.delete(reverse('profiling-stats')).status_code == 403
+    assert client.get(reverse('catalog-cache-stats')).status_code == 403
+    assert client.get(reverse('db-pool-stats')).status_code == 403
+
+    with override_settings(PROFILING_HEADER_PUBLIC=True):
+        assert client.get(reverse('customer-list-create'), HTTP_X_PROFILE='1').has_header('Server-Timing')
@@ -0,0 +1,50 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from shopify.models import Customer
+from shopify.renderers import FastJSONParser, FastJSONRenderer
+
+
+def test_fast_renderer_matches_drf_byte_for_byte():
+    data = {
+        'uuid': uuid.uuid4(),
+        'total': Decimal('1234.50'),
+        'created_at': datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc),
+        'day': date(2025, 1, 2),
+        'at': time(12, 30),
+        'note': 'café     "quoted"',
+        'nested': [{'n': 1, 'f': 0.1, 'none': None, 'flag': True}],
+        'big': 2 ** 70,
+        3: 'int key',
+    }
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data, 'application/json; indent=2') == JSONRenderer().render(data, 'application/json; indent=2')
+
+def test_fast_parser_matches_drf():
+    body = json.dumps({'a': [1, 2.5, 'xé'], 'b': None}).encode()
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"a": NaN}'))
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"a": '))
+
+@pytest.mark.django_db
+def test_api_round_trips_through_fast_json():
+    client = Client()
+    response = client.post(
+        reverse('customer-list-create'),
+        data=json.dumps({'name': 'Test User', 'email': f'test_{uuid.uuid4()}@example.com'}),
+        content_type='application/json',
+    )
+    assert response.status_code == 201, response.content
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert Customer.objects.get().name == response.json()['name']
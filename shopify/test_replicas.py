@@ -0,0 +1,92 @@
+import json
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from shopify import routers
+from shopify.models import Customer, Order
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+@pytest.fixture
+def routed_reads(monkeypatch):
+    # Records, per read, whether the request was routed to a replica
+    reads = []
+    db_for_read = routers.ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        reads.append(routers._replica_reads.get())
+        return db_for_read(self, model, **hints)
+    monkeypatch.setattr(routers.ReplicaRouter, 'db_for_read', spy)
+    return reads
+
+def test_only_safe_reads_of_marked_views_use_replicas(replicas):
+    factory, router = RequestFactory(), routers.ReplicaRouter()
+    assert routers.reads_from_replica(factory.get(reverse('order-list-create')))
+    assert routers.reads_from_replica(factory.get(reverse('sales-analytics')))
+    assert not routers.reads_from_replica(factory.post(reverse('order-list-create')))
+    # Cached catalog responses must not be refilled from a lagging replica
+    assert not routers.reads_from_replica(factory.get(reverse('product-list-create')))
+    assert not routers.reads_from_replica(factory.get('/no-such-page/'))
+
+    assert router.db_for_read(Order) == DEFAULT_DB_ALIAS
+    with routers.replica_reads():
+        assert router.db_for_read(Order) == 'replica'
+        assert router.db_for_write(Order) == DEFAULT_DB_ALIAS
+    assert not router.allow_migrate('replica', 'shopify')
+
+def test_reads_stay_on_the_primary_without_replicas():
+    with routers.replica_reads():
+        assert routers.ReplicaRouter().db_for_read(Order) == DEFAULT_DB_ALIAS
+
+@pytest.mark.django_db
+def test_writes_pin_the_client_to_the_primary(replicas, routed_reads):
+    client = Client()
+    Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    assert client.get(reverse('customer-list-create')).status_code == 200
+    assert routed_reads and all(routed_reads)
+
+    response = client.post(
+        reverse('customer-list-create'),
+        data=json.dumps({'name': 'New', 'email': f'test_{uuid.uuid4()}@example.com'}),
+        content_type='application/json',
+    )
+    assert response.status_code == 201 and routers.PIN_COOKIE in response.cookies
+
+    routed_reads.clear()
+    body = client.get(reverse('customer-list-create')).json()
+    assert len(body['results']) == 2
+    assert routed_reads and not any(routed_reads)
+
+@pytest.mark.django_db
+def test_streamed_exports_read_from_replicas(replicas, routed_reads):
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    Order.objects.create(customer=customer, total_amount=10)
+    response = Client().get(reverse('order-export'), {'export_format': 'ndjson'})
+    assert len(b''.join(response.streaming_content).splitlines()) == 1
+    assert routed_reads and all(routed_reads)
+
+@pytest.mark.django_db
+def test_clients_without_cookies_are_pinned_by_header_or_user(replicas, staff_client):
+    url = reverse('customer-list-create')
+    payload = lambda: json.dumps({'name': 'New', 'email': f'test_{uuid.uuid4()}@example.com'})
+    response = Client().post(url, data=payload(), content_type='application/json')
+    until = response[routers.PIN_HEADER]
+
+    factory = RequestFactory()
+    assert routers.reads_from_replica(factory.get(url))
+    assert not routers.reads_from_replica(factory.get(url, headers={routers.PIN_HEADER: until}))
+    assert routers.reads_from_replica(factory.get(url, headers={routers.PIN_HEADER: 'soon'}))
+
+    # A signed-in API client is pinned on every session, cookie jar or not
+    assert staff_client.post(url, data=payload(), content_type='application/json').status_code == 201
+    user = get_user_model().objects.get(username='staff')
+    assert not routers.reads_from_replica(factory.get(url), user)
+    assert routers.reads_from_replica(factory.get(url), AnonymousUser())
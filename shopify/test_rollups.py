@@ -0,0 +1,112 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.db.models import Sum
+from django.urls import reverse
+from django.test import Client
+from shopify.models import (
+    Customer, Product, Order, OrderItem, DailySales, DailyProductSales, CustomerSpend
+)
+from shopify.rollups import rebuild_rollups
+
+
+def snapshot_rollups():
+    return (
+        sorted(DailySales.objects.values('date').annotate(Sum('order_count'), Sum('total_sales')).values_list('date', 'order_count__sum', 'total_sales__sum')),
+        sorted(DailyProductSales.objects.filter(quantity__gt=0).values_list('date', 'product_id', 'quantity')),
+        sorted(CustomerSpend.objects.filter(order_count__gt=0).values_list('customer_id', 'order_count', 'total_spent')),
+    )
+
+@pytest.mark.django_db
+def test_rollups_follow_order_writes():
+    alice = Customer.objects.create(name="Alice", email=f"test_{uuid.uuid4()}@example.com")
+    bob = Customer.objects.create(name="Bob", email=f"test_{uuid.uuid4()}@example.com")
+    pen = Product.objects.create(name='Pen', price=2, sku=str(uuid.uuid4()))
+    ink = Product.objects.create(name='Ink', price=5, sku=str(uuid.uuid4()))
+
+    first = Order.objects.create(customer=alice, total_amount=Decimal('12.00'))
+    OrderItem.objects.create(order=first, product=pen, quantity=1, unit_price=2)
+    item = OrderItem.objects.create(order=first, product=ink, quantity=2, unit_price=5)
+    second = Order.objects.create(customer=bob, total_amount=Decimal('4.00'))
+    OrderItem.objects.create(order=second, product=pen, quantity=2, unit_price=2)
+    third = Order.objects.create(customer=bob, total_amount=Decimal('5.00'))
+    OrderItem.objects.create(order=third, product=ink, quantity=1, unit_price=5)
+
+    # Updates move the deltas, deletes (including cascades) remove them
+    first.total_amount = Decimal('17.00')
+    first.save()
+    item.quantity = 3
+    item.save()
+    third.delete()
+
+    incremental = snapshot_rollups()
+    rebuild_rollups()
+    assert incremental == snapshot_rollups()
+
+    assert DailyProductSales.objects.get(product=ink).quantity == 3
+    assert CustomerSpend.objects.get(customer=alice).total_spent == Decimal('17.00')
+
+@pytest.mark.django_db
+def test_sales_analytics_matches_order_tables():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    product = Product.objects.create(name='Test Product', price=10, sku=str(uuid.uuid4()))
+    for quantity in (1, 2, 3):
+        order = Order.objects.create(customer=customer, total_amount=10 * quantity)
+        OrderItem.objects.create(order=order, product=product, quantity=quantity, unit_price=10)
+
+    response = client.get(reverse('sales-analytics'))
+    assert response.status_code == 200, response.content
+    body = response.json()
+
+    assert body['total_orders'] == Order.objects.count()
+    assert Decimal(body['total_sales']) == Order.objects.aggregate(total=Sum('total_amount'))['total']
+    assert Decimal(body['monthly_sales']) == Decimal('60')
+    assert body['top_products'] == [{'product__name': 'Test Product', 'total_quantity': 6}]
+    assert body['top_customers'][0]['email'] == customer.email
+    assert Decimal(body['top_customers'][0]['spent']) == Decimal('60')
+
+@pytest.mark.django_db
+def test_sales_series_buckets():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    orders = [Order.objects.create(customer=customer, total_amount=amount) for amount in (10, 20, 30)]
+    Order.objects.filter(pk=orders[0].pk).update(created_at='2025-03-03T09:15:00Z')
+    Order.objects.filter(pk=orders[1].pk).update(created_at='2025-03-03T09:45:00Z')
+    Order.objects.filter(pk=orders[2].pk).update(created_at='2025-03-05T18:00:00Z')
+    rebuild_rollups()
+    url = reverse('sales-analytics-series')
+
+    hourly = client.get(url, {'interval': 'hour', 'start': '2025-03-03', 'end': '2025-03-04'}).json()
+    assert [(b['order_count'], Decimal(b['total_sales'])) for b in hourly['buckets']] == [(2, Decimal('30'))]
+
+    daily = client.get(url, {'interval': 'day', 'start': '2025-03-01', 'end': '2025-03-06'}).json()
+    assert [(b['bucket'], b['order_count']) for b in daily['buckets']] == [('2025-03-03', 2), ('2025-03-05', 1)]
+
+    weekly = client.get(url, {'interval': 'week', 'start': '2025-03-01', 'end': '2025-03-10'}).json()
+    assert [(b['bucket'], b['order_count']) for b in weekly['buckets']] == [('2025-03-03', 3)]
+
+    # Mid-day bounds count only the orders inside [start, end)
+    partial = client.get(url, {'interval': 'day', 'start': '2025-03-03T09:30:00Z', 'end': '2025-03-05T12:00:00Z'}).json()
+    assert [(b['bucket'], b['order_count']) for b in partial['buckets']] == [('2025-03-03', 1)]
+    partial = client.get(url, {'interval': 'week', 'start': '2025-03-03T09:30:00Z', 'end': '2025-03-05T19:00:00Z'}).json()
+    assert [(b['bucket'], b['order_count'], Decimal(b['total_sales'])) for b in partial['buckets']] == [('2025-03-03', 2, Decimal('50'))]
+    partial = client.get(url, {'interval': 'day', 'start': '2025-03-03T09:00:00Z', 'end': '2025-03-03T09:30:00Z'}).json()
+    assert [(b['bucket'], b['order_count']) for b in partial['buckets']] == [('2025-03-03', 1)]
+
+    assert client.get(url, {'interval': 'month'}).status_code == 400
+    assert client.get(url, {'start': 'yesterday'}).status_code == 400
+
+@pytest.mark.django_db
+def test_daily_sales_shards_sum_to_the_order_totals(settings):
+    settings.ROLLUP_SHARDS = 4
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    orders = [Order.objects.create(customer=customer, total_amount=amount) for amount in range(1, 21)]
+    for order in orders[:5]:
+        order.delete()
+
+    assert DailySales.objects.count() > 1
+    assert DailySales.objects.aggregate(Sum('order_count'), Sum('total_sales')) == {
+        'order_count__sum': 15, 'total_sales__sum': Decimal('195'),
+    }
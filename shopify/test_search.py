@@ -0,0 +1,30 @@
+import uuid
+
+import pytest
+from django.urls import reverse
+from django.test import Client
+from shopify.models import Category, Product
+
+
+def create_product(name, description, **kwargs):
+    return Product.objects.create(name=name, description=description, price=1, sku=str(uuid.uuid4()), **kwargs)
+
+@pytest.mark.django_db
+def test_search_ranks_name_matches_and_filters():
+    client = Client()
+    pens = Category.objects.create(name='Pens', slug='pens')
+    fountain = create_product('Fountain pen', 'Refillable steel nib', category=pens)
+    create_product('Notebook', 'Pairs well with a fountain pen')
+    create_product('Fountain pen cleaner', 'Retired', is_active=False)
+    create_product('Stapler', 'Heavy duty')
+    url = reverse('product-search')
+
+    body = client.get(url, {'q': 'fountain pen'}).json()
+    assert [row['name'] for row in body['results']] == ['Fountain pen', 'Notebook']
+    assert body['results'][0]['rank'] > body['results'][1]['rank']
+
+    body = client.get(url, {'q': 'fountain', 'category': pens.id}).json()
+    assert [row['id'] for row in body['results']] == [fountain.id]
+
+    assert len(client.get(url, {'q': 'fountain', 'limit': 1}).json()['results']) == 1
+    assert client.get(url).status_code == 400
@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify.models import Customer, Category, Product, Order, Payment
+
+
+@pytest.mark.django_db
+def test_fields_narrow_response_and_sql():
+    client = Client()
+    Product.objects.create(name='Pen', description='A very long description', price=1, sku=str(uuid.uuid4()))
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse('product-list-create'), {'fields': 'id,name,price'})
+    assert response.status_code == 200, response.content
+    assert list(response.json()['results'][0]) == ['id', 'name', 'price']
+    select = next(q['sql'] for q in context.captured_queries if 'created_at' in q['sql'] and 'MAX' not in q['sql'])
+    assert '"description"' not in select
+
+@pytest.mark.django_db
+def test_expand_nests_related_objects_without_extra_queries():
+    client = Client()
+    category = Category.objects.create(name='Stationery', slug='stationery')
+    for i in range(3):
+        Product.objects.create(name=f'Pen {i}', price=1, sku=str(uuid.uuid4()), category=category)
+
+    with CaptureQueriesContext(connection) as context:
+        body = client.get(reverse('product-list-create'), {'expand': 'category', 'fields': 'id,category'}).json()
+    assert body['results'][0]['category'] == {'id': category.id, 'name': 'Stationery', 'slug': 'stationery'}
+    assert len(context.captured_queries) == 2  # validator + page
+
+@pytest.mark.django_db
+def test_order_fields_skip_unrendered_prefetches():
+    client = Client()
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    order = Order.objects.create(customer=customer, total_amount=5)
+    Payment.objects.create(order=order, amount=5, payment_method='Card')
+
+    with CaptureQueriesContext(connection) as context:
+        body = client.get(reverse('order-list-create'), {'fields': 'uuid,total_amount'}).json()
+    assert body['results'] == [{'uuid': str(order.pk), 'total_amount': '5.00'}]
+    assert len(context.captured_queries) == 1
+
+    body = client.get(reverse('order-list-create'), {'expand': 'customer,payments'}).json()
+    result = body['results'][0]
+    assert result['customer']['email'] == customer.email
+    assert result['payments'][0]['payment_method'] == 'Card'
+    assert result['items'] == []
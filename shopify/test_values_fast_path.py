@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from shopify import catalog_cache, views
+from shopify.models import Customer, Category, Product, Order, OrderItem, Payment, Shipment
+
+
+def get_both_ways(monkeypatch, view, url, params=None):
+    client = Client()
+    with CaptureQueriesContext(connection) as context:
+        fast = client.get(url, params)
+    assert fast.status_code == 200, fast.content
+    queries = len(context.captured_queries)
+    monkeypatch.setattr(view, 'values_fast_path', False)
+    catalog_cache.get_cache().clear()
+    slow = client.get(url, params)
+    monkeypatch.setattr(view, 'values_fast_path', True)
+    return fast, slow, queries
+
+@pytest.fixture
+def orders():
+    customer = Customer.objects.create(name="Test User", email=f"test_{uuid.uuid4()}@example.com")
+    category = Category.objects.create(name='Stationery', slug='stationery')
+    pen = Product.objects.create(name='Pen', price='1.50', stock=10, sku=str(uuid.uuid4()), category=category)
+    ink = Product.objects.create(name='Ink', price=2, stock=10, sku=str(uuid.uuid4()), image='product_images/ink.png')
+    placed = []
+    for i in range(3):
+        order = Order.objects.create(customer=customer, total_amount=i + 0.5)
+        OrderItem.objects.create(order=order, product=pen, quantity=i + 1, unit_price='1.50')
+        if i:
+            OrderItem.objects.create(order=order, product=ink, quantity=1, unit_price=2)
+            Payment.objects.create(order=order, amount=2, payment_method='Card')
+        if i == 2:
+            Shipment.objects.create(order=order, tracking_number='T1', carrier='DHL')
+        placed.append(order)
+    return placed
+
+@pytest.mark.django_db
+def test_order_list_fast_path_matches_serializers(monkeypatch, orders):
+    fast, slow, queries = get_both_ways(monkeypatch, views.OrderListCreateView, reverse('order-list-create'), {'page_size': 2})
+    assert fast.content == slow.content
+    assert queries == 4  # page + items + payments + shipments
+
+    cursor = fast.json()['next']
+    fast, slow, _ = get_both_ways(monkeypatch, views.OrderListCreateView, cursor)
+    assert fast.content == slow.content
+    assert len(fast.json()['results']) == 1
+
+@pytest.mark.django_db
+def test_product_and_item_lists_fast_path_match_serializers(monkeypatch, orders):
+    fast, slow, _ = get_both_ways(monkeypatch, views.ProductListCreateView, reverse('product-list-create'))
+    assert fast.content == slow.content
+    assert fast.json()['results'][0]['image'].endswith('/product_images/ink.png')
+
+    fast, slow, _ = get_both_ways(monkeypatch, views.OrderItemListCreateView, reverse('order-item-list-create'),
+                                  {'order_id': str(orders[1].pk), 'fields': 'id,quantity'})
+    assert fast.content == slow.content
+    assert len(fast.json()['results']) == 2
+
+@pytest.mark.django_db
+def test_expand_falls_back_to_serializers(monkeypatch, orders):
+    body = Client().get(reverse('order-item-list-create'), {'expand': 'product'}).json()
+    assert body['results'][0]['product']['name'] in ('Pen', 'Ink')
@@ -1,93 +1,391 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
+from django.views import View
 from rest_framework import generics
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date, quote_etag
 from django.utils.timezone import now, timedelta
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Count, DateField, Max, Q, Sum
+from django.db.models.functions import TruncHour, TruncDay, TruncWeek
 
+import hashlib
 import uuid
+from datetime import datetime, time
 
+from django.conf import settings
+
+from . import autocomplete, catalog_cache, dbpool, exports, parallel, profiling
 from .models import (
-    Customer, Cart, Wishlist, Product, Category,
-    Order, OrderItem, Payment, Shipment
+    Customer, Cart, CartItem, Wishlist, Product, Category,
+    Order, OrderItem, Payment, Shipment,
+    DailySales, DailyProductSales, CustomerSpend
 )
+from .search import search_products
 from .serializers import (
-    CustomerSerializer, CartSerializer, WishlistSerializer, ProductSerializer,
+    CustomerSerializer, CartSerializer, CartItemSerializer, WishlistSerializer, ProductSerializer,
     CategorySerializer, OrderSerializer, OrderItemSerializer,
-    PaymentSerializer, ShipmentSerializer
+    PaymentSerializer, ShipmentSerializer, CheckoutSerializer,
+    sparse_fieldset_params
 )
 
 
-class CustomerListCreateView(generics.ListCreateAPIView):
+def parse_datetime_param(request, name):
+    # Accepts an ISO date or datetime; naive values are in the current time zone
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = day and datetime.combine(day, time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Invalid date format'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+# Applies the serializer's declared select_related/prefetch_related needs,
+# narrowed to the ?fields=/?expand= of the request
+class EagerLoadingMixin:
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            fields, expand = sparse_fieldset_params(self.request)
+            queryset = serializer_class.setup_eager_loading(
+                queryset, fields=fields, expand=expand, required=self.get_required_columns()
+            )
+        return queryset
+
+    def get_required_columns(self):
+        # Columns the paginator reads from each row to build its cursor
+        ordering = getattr(self, 'ordering', None) or getattr(self.paginator, 'ordering', None) or ()
+        return [name.lstrip('-') for name in ordering]
+
+# A JSON list body on POST creates every row through the serializer's
+# list_serializer_class; DELETE with a list of ids removes them in one query.
+class BulkCreateMixin:
+    bulk_max_length = 1000
+
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+            kwargs['max_length'] = self.bulk_max_length
+        return super().get_serializer(*args, **kwargs)
+
+class BulkDestroyMixin:
+    bulk_max_length = 1000
+
+    def delete(self, request, *args, **kwargs):
+        ids = request.data
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({'ids': 'Expected a non-empty list of ids'})
+        if len(ids) > self.bulk_max_length:
+            raise ValidationError({'ids': f'At most {self.bulk_max_length} ids per request'})
+        model = self.get_queryset().model
+        try:
+            pks = {model._meta.pk.to_python(pk) for pk in ids}
+        except (DjangoValidationError, TypeError):
+            raise ValidationError({'ids': 'Invalid id'})
+        _, deleted = model.objects.filter(pk__in=pks).delete()
+        return Response({'deleted': deleted.get(model._meta.label, 0)})
+
+# Read-only fast path for list pages: the page is fetched with .values() and
+# rendered by the serializer's ValuesRepresentationMixin. Views opt in with
+# values_fast_path; requests the serializer cannot render that way (e.g.
+# ?expand=) go through the regular path.
+class ValuesListMixin:
+    values_fast_path = True
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        columns = serializer.get_values_columns() if self.values_fast_path else None
+        if columns is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_values_queryset(columns)
+        page = self.paginate_queryset(queryset)
+        data = serializer.values_representation(page if page is not None else list(queryset))
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_values_queryset(self, columns):
+        model = self.get_queryset().model
+        required = [
+            (model._meta.pk if name == 'pk' else model._meta.get_field(name)).attname
+            for name in self.get_required_columns()
+        ]
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        return queryset.values(*dict.fromkeys([*columns, *required]))
+
+# ?ids=1,2,3 on a list view fetches exactly those rows with one IN query,
+# returned in request order (unpaginated) along with the ids that were not found.
+class BatchFetchMixin:
+    batch_param = 'ids'
+    batch_max_size = 100
+
+    def list(self, request, *args, **kwargs):
+        raw = request.query_params.get(self.batch_param)
+        if raw is None:
+            return super().list(request, *args, **kwargs)
+
+        values = [value.strip() for value in raw.split(',') if value.strip()]
+        if not values:
+            raise ValidationError({self.batch_param: 'Expected a comma-separated list'})
+        if len(values) > self.batch_max_size:
+            raise ValidationError({self.batch_param: f'At most {self.batch_max_size} per request'})
+        pk_field = self.get_queryset().model._meta.pk
+        try:
+            pks = list(dict.fromkeys(pk_field.to_python(value) for value in values))
+        except DjangoValidationError:
+            raise ValidationError({self.batch_param: 'Invalid id'})
+
+        objects = self.filter_queryset(self.get_queryset()).in_bulk(pks)
+        serializer = self.get_serializer([objects[pk] for pk in pks if pk in objects], many=True)
+        return Response({
+            'results': serializer.data,
+            'missing': [pk if isinstance(pk, int) else str(pk) for pk in pks if pk not in objects],
+        })
+
+# Conditional GET: the validator is max(updated_at) plus row count for the
+# requested rows (one aggregate query), so an unchanged resource is answered
+# with 304 before anything is serialized.
+class ConditionalGetMixin:
+    def get(self, request, *args, **kwargs):
+        validator = self.get_validator()
+        last_modified = validator['last_modified']
+        digest = hashlib.md5(
+            f"{request.get_full_path()}|{request.accepted_media_type}|{validator['count']}|"
+            f"{last_modified.isoformat() if last_modified else ''}".encode()
+        ).hexdigest()
+        etag = quote_etag(digest)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def get_validator(self):
+        return self.get_validator_queryset().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset.order_by()
+
+# Read-through cache for list/retrieve (and the conditional GET validator, when
+# combined with ConditionalGetMixin). cache_namespaces are formatted with the
+# URL kwargs and their versions are bumped by catalog_cache on writes.
+# These views read the primary: a lagging replica would re-cache the old rows
+# under the freshly bumped version.
+class CachedReadMixin:
+    cache_namespaces = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response('list', super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response('retrieve', super().retrieve, request, *args, **kwargs)
+
+    def get_validator(self):
+        cache = catalog_cache.get_cache()
+        key = self.get_cache_key('validator')
+        validator = cache.get(key)
+        if validator is None:
+            validator = super().get_validator()
+            cache.set(key, validator, settings.CATALOG_CACHE_TIMEOUT)
+        return validator
+
+    def get_cache_key(self, kind):
+        namespaces = [namespace.format(**self.kwargs) for namespace in self.cache_namespaces]
+        # Scheme and host are part of the key: cached pages carry absolute next/previous links
+        return catalog_cache.build_key(namespaces, f'{kind}:{self.request.build_absolute_uri()}')
+
+    def cached_response(self, kind, handler, request, *args, **kwargs):
+        cache = catalog_cache.get_cache()
+        key = self.get_cache_key(kind)
+        data = cache.get(key)
+        if data is not None:
+            catalog_cache.record('hit')
+            return Response(data)
+        catalog_cache.record('miss')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+class CustomerListCreateView(ConditionalGetMixin, BatchFetchMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
+    replica_reads = True
 
-class CustomerDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CustomerDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
+    replica_reads = True
 
 # Cart
-class CartListCreateView(generics.ListCreateAPIView):
+class CartListCreateView(ConditionalGetMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Cart.objects.all()
     serializer_class = CartSerializer
+    replica_reads = True
 
-class CartDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CartDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Cart.objects.all()
     serializer_class = CartSerializer
+    replica_reads = True
+
+# Cart items: writes move Cart.total_amount by F() deltas (see carts.py)
+class CartItemListCreateView(EagerLoadingMixin, generics.ListCreateAPIView):
+    queryset = CartItem.objects.all()
+    serializer_class = CartItemSerializer
+    replica_reads = True
+    ordering = ('-pk',)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        cart_id = self.request.query_params.get('cart_id')
+        if cart_id:
+            if not cart_id.isdigit():
+                raise ValidationError({'cart_id': 'Must be a cart id'})
+            queryset = queryset.filter(cart_id=int(cart_id))
+        return queryset
+
+class CartItemDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = CartItem.objects.all()
+    serializer_class = CartItemSerializer
+    replica_reads = True
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
 
 # Wishlist
-class WishlistListCreateView(generics.ListCreateAPIView):
+class WishlistListCreateView(EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Wishlist.objects.all()
     serializer_class = WishlistSerializer
+    replica_reads = True
 
-class WishlistDetailView(generics.RetrieveUpdateDestroyAPIView):
+class WishlistDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Wishlist.objects.all()
     serializer_class = WishlistSerializer
+    replica_reads = True
 
 # Product
-class ProductListCreateView(generics.ListCreateAPIView):
+class ProductListCreateView(CachedReadMixin, ConditionalGetMixin, BatchFetchMixin, BulkCreateMixin, BulkDestroyMixin, ValuesListMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    cache_namespaces = ('products',)
 
-class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        category = self.request.query_params.get('category')
+        if category:
+            # The active products of a category (served by product_active_category_idx)
+            if not category.isdigit():
+                raise ValidationError({'category': 'Must be a category id'})
+            queryset = queryset.filter(category_id=int(category), is_active=True)
+        return queryset
+
+class ProductDetailView(CachedReadMixin, ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    cache_namespaces = ('product:{pk}', 'product-catalog')
+
+class ProductSearchView(APIView):
+    replica_reads = True
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This parameter is required'})
+        category = request.query_params.get('category')
+        if category is not None and not category.isdigit():
+            raise ValidationError({'category': 'Must be a category id'})
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer'})
+
+        products = search_products(query, category=category and int(category), limit=limit)
+        results = ProductSerializer(products, many=True, context={'request': request}).data
+        for row, product in zip(results, products):
+            row['rank'] = product.rank
+        return Response({"query": query, "results": results})
+
+class ProductAutocompleteView(APIView):
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer'})
+        return Response(autocomplete.index.search(request.query_params.get('q', ''), limit=limit))
 
 # Category
-class CategoryListCreateView(generics.ListCreateAPIView):
+class CategoryListCreateView(CachedReadMixin, ValuesListMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    ordering = ('-pk',)
+    cache_namespaces = ('categories',)
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    replica_reads = True
 
 # Order
-class OrderListCreateView(ListCreateAPIView):
+class OrderListCreateView(BatchFetchMixin, ValuesListMixin, EagerLoadingMixin, ListCreateAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    replica_reads = True
+    batch_param = 'uuids'
 
     def get_queryset(self):
         queryset = super().get_queryset()
         customer_id = self.request.query_params.get('customer_id')
         if customer_id:
-            try:
-                customer_uuid = uuid.UUID(customer_id)
-            except ValueError:
-                raise ValidationError({'customer_id': 'Invalid UUID format'})
-            queryset = queryset.filter(customer_id=customer_uuid)
+            # Customer keys are integers (served by order_customer_created_idx)
+            if not customer_id.isdigit():
+                raise ValidationError({'customer_id': 'Must be a customer id'})
+            queryset = queryset.filter(customer_id=int(customer_id))
         return queryset
 
-class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrderDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    replica_reads = True
 
 # OrderItem
-class OrderItemListCreateView(generics.ListCreateAPIView):
+class OrderItemListCreateView(BulkCreateMixin, BulkDestroyMixin, ValuesListMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
+    replica_reads = True
+    ordering = ('-pk',)
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -100,59 +398,328 @@ class OrderItemListCreateView(generics.ListCreateAPIView):
             queryset = queryset.filter(order_id=order_uuid)
         return queryset
 
-class OrderItemDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrderItemDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
+    replica_reads = True
 
 # Payment
-class PaymentListCreateView(generics.ListCreateAPIView):
+class PaymentListCreateView(ConditionalGetMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    replica_reads = True
 
-class PaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PaymentDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    replica_reads = True
 
 # Shipment
-class ShipmentListCreateView(generics.ListCreateAPIView):
+class ShipmentListCreateView(ConditionalGetMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     queryset = Shipment.objects.all()
     serializer_class = ShipmentSerializer
+    replica_reads = True
 
-class ShipmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ShipmentDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Shipment.objects.all()
     serializer_class = ShipmentSerializer
+    replica_reads = True
+
+# Exports
+class ExportView(APIView):
+    queryset = None
+    columns = ()
+    created_at_field = 'created_at'
+    status_field = 'status'
+    filename = 'export'
+    replica_reads = True
+
+    def get(self, request):
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in exports.FORMATS:
+            raise ValidationError({'export_format': f"Must be one of: {', '.join(exports.FORMATS)}"})
+
+        queryset = self.queryset.all()
+        start = parse_datetime_param(request, 'start')
+        end = parse_datetime_param(request, 'end')
+        if start:
+            queryset = queryset.filter(**{f'{self.created_at_field}__gte': start})
+        if end:
+            queryset = queryset.filter(**{f'{self.created_at_field}__lt': end})
+        status = request.query_params.get('status')
+        if status:
+            queryset = queryset.filter(**{self.status_field: status})
+
+        queryset = queryset.order_by(self.created_at_field, 'pk')
+        # Served by ASGI, the response has to be streamed by an async iterator
+        asynchronous = isinstance(request._request, ASGIRequest)
+        return exports.stream_queryset(queryset, self.columns, export_format, self.filename, asynchronous)
+
+class OrderExportView(ExportView):
+    queryset = Order.objects.all()
+    columns = ('uuid', 'customer_id', 'status', 'total_amount', 'created_at', 'updated_at')
+    filename = 'orders'
+
+class OrderItemExportView(ExportView):
+    queryset = OrderItem.objects.all()
+    columns = ('id', 'order_id', 'product_id', 'quantity', 'unit_price', 'order__created_at', 'order__status')
+    created_at_field = 'order__created_at'
+    status_field = 'order__status'
+    filename = 'order-items'
+
+# Checkout
+class CheckoutView(generics.CreateAPIView):
+    serializer_class = CheckoutSerializer
+
+# Cache monitoring
+class CatalogCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(catalog_cache.stats())
+
+# Per-view request profiles collected by ProfilingMiddleware
+class ProfilingStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(profiling.stats())
+
+    def delete(self, request):
+        profiling.reset()
+        return Response(status=204)
+
+# Connection reuse per database alias (see Ecommerce/settings.py DB_POOL)
+class DatabasePoolStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(dbpool.stats())
 
 # Analytics View
 class SalesAnalyticsView(APIView):
+    # Reads only the rollup tables maintained by shopify.rollups, so the cost
+    # tracks the number of days/products/customers rather than order rows.
+    # The three independent queries run concurrently (see parallel.py).
+    replica_reads = True
+
     def get(self, request):
-        today = now().date()
-        last_30_days = today - timedelta(days=30)
+        return Response(self.build(*parallel.fan_out(self.get_queries())))
 
-        total_orders = Order.objects.count()
-        total_sales = Order.objects.aggregate(total=Sum('total_amount'))['total'] or 0
+    @staticmethod
+    def get_queries():
+        last_30_days = now().date() - timedelta(days=30)
+        def totals():
+            # All-time and 30-day figures in one pass over DailySales
+            return DailySales.objects.aggregate(
+                orders=Sum('order_count'),
+                sales=Sum('total_sales'),
+                monthly=Sum('total_sales', filter=Q(date__gte=last_30_days)),
+            )
 
-        monthly_orders = Order.objects.filter(created_at__gte=last_30_days)
-        monthly_sales = monthly_orders.aggregate(total=Sum('total_amount'))['total'] or 0
+        def top_products():
+            return list(
+                DailyProductSales.objects.values('product__name').annotate(
+                    total_quantity=Sum('quantity')
+                ).order_by('-total_quantity')[:5]
+            )
 
-        top_products = OrderItem.objects.values('product__name').annotate(
-            total_quantity=Sum('quantity')
-        ).order_by('-total_quantity')[:5]
+        def top_customers():
+            return list(CustomerSpend.objects.select_related('customer').order_by('-total_spent')[:5])
 
-        top_customers = Customer.objects.annotate(
-            total_spent=Sum('orders__total_amount')
-        ).order_by('-total_spent')[:5]
+        return totals, top_products, top_customers
 
-        return Response({
-            "total_orders": total_orders,
-            "total_sales": total_sales,
-            "monthly_sales": monthly_sales,
-            "top_products": list(top_products),
+    @staticmethod
+    def build(totals, top_products, top_customers):
+        return {
+            "total_orders": totals['orders'] or 0,
+            "total_sales": totals['sales'] or 0,
+            "monthly_sales": totals['monthly'] or 0,
+            "top_products": top_products,
             "top_customers": [
                 {
-                    "name": f"{c.name}",
-                    "email": c.email,
-                    "spent": c.total_spent
+                    "name": f"{s.customer.name}",
+                    "email": s.customer.email,
+                    "spent": s.total_spent
                 }
-                for c in top_customers
+                for s in top_customers
             ]
+        }
+
+# Sales time series
+class SalesSeriesView(APIView):
+    # Hourly buckets group Order rows in the database (index on created_at,
+    # total_amount); daily and weekly buckets group the DailySales rollup.
+    intervals = {
+        'hour': TruncHour,
+        'day': TruncDay,
+        'week': TruncWeek,
+    }
+    default_range = timedelta(days=30)
+    max_hourly_range = timedelta(days=366)
+    replica_reads = True
+
+    def get(self, request):
+        interval = request.query_params.get('interval', 'day')
+        if interval not in self.intervals:
+            raise ValidationError({'interval': f"Must be one of: {', '.join(self.intervals)}"})
+
+        end = parse_datetime_param(request, 'end') or now()
+        start = parse_datetime_param(request, 'start') or end - self.default_range
+        if start >= end:
+            raise ValidationError({'start': 'Must be before end'})
+
+        trunc = self.intervals[interval]
+        if interval == 'hour':
+            if end - start > self.max_hourly_range:
+                raise ValidationError({'start': 'Hourly series are limited to 366 days'})
+            buckets = list(self.order_buckets(trunc('created_at'), start, end))
+        else:
+            buckets = self.rollup_buckets(trunc, start, end)
+
+        return Response({
+            "interval": interval,
+            "start": start,
+            "end": end,
+            "buckets": buckets,
         })
+
+    def rollup_buckets(self, trunc, start, end):
+        # Whole days come from DailySales; the partial days at either edge of
+        # [start, end) are counted from Order so no order outside the range
+        # is included
+        first_day, end_day = self.ceil_date(start), timezone.localdate(end)
+        by_date = trunc('created_at', output_field=DateField())
+        if first_day >= end_day:
+            parts = [self.order_buckets(by_date, start, end)]
+        else:
+            parts = [
+                DailySales.objects.filter(date__gte=first_day, date__lt=end_day)
+                .annotate(bucket=trunc('date'))
+                .values('bucket')
+                .annotate(order_count=Sum('order_count'), total_sales=Sum('total_sales')),
+                self.order_buckets(by_date, start, self.midnight(first_day)),
+                self.order_buckets(by_date, self.midnight(end_day), end),
+            ]
+        merged = {}
+        for part in parts:
+            for row in part:
+                bucket = merged.setdefault(row['bucket'], {'bucket': row['bucket'], 'order_count': 0, 'total_sales': 0})
+                bucket['order_count'] += row['order_count']
+                bucket['total_sales'] += row['total_sales']
+        return [merged[bucket] for bucket in sorted(merged)]
+
+    @staticmethod
+    def order_buckets(bucket, start, end):
+        if start >= end:
+            return []
+        return (
+            Order.objects.filter(created_at__gte=start, created_at__lt=end)
+            .order_by()
+            .annotate(bucket=bucket)
+            .values('bucket')
+            .annotate(order_count=Count('pk'), total_sales=Sum('total_amount'))
+            .order_by('bucket')
+        )
+
+    @staticmethod
+    def ceil_date(value):
+        # First whole day not covered by the half-open range ending at value
+        local = timezone.localtime(value)
+        day = local.date()
+        if local.time() != time.min:
+            day += timedelta(days=1)
+        return day
+
+    @staticmethod
+    def midnight(day):
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+
+
+# Async read endpoints for ASGI deployments. Each wraps the sync view's
+# queryset, ordering and serializer, fetches rows with the async ORM and
+# renders them with the .values() fast path, so a request waiting on the
+# database or a slow client holds no worker thread. Requests that path cannot
+# render (e.g. ?expand=) are handed to the sync view in a thread.
+class AsyncReadView(View):
+    sync_view_class = None
+
+    def get_sync_view(self, request, **kwargs):
+        # The DRF view as its dispatch() would set it up, without running it
+        view = self.sync_view_class()
+        view.setup(request, **kwargs)
+        view.format_kwarg = view.get_format_suffix(**kwargs)
+        view.request = view.initialize_request(request, **kwargs)
+        view.headers = view.default_response_headers
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        view = self.view = self.get_sync_view(request, **kwargs)
+        try:
+            # Authentication, permissions, throttles and content negotiation of
+            # the sync view; authenticating may read the session
+            await sync_to_async(view.initial)(view.request, *args, **kwargs)
+            if view.request.accepted_renderer.format != 'json':
+                # e.g. the browsable API, which renders forms with the sync ORM
+                return await self.fallback(**kwargs)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return self.respond(view.handle_exception(exc))
+
+    async def fallback(self, **kwargs):
+        # Runs the sync view's handler on the already initialised request
+        view = self.view
+
+        def respond():
+            try:
+                response = getattr(view, view.request.method.lower())(view.request, **kwargs)
+            except Exception as exc:
+                response = view.handle_exception(exc)
+            return self.respond(response)
+        return await sync_to_async(respond)()
+
+    def respond(self, response):
+        # Rendered with the renderer the sync view negotiated (API_FAST_JSON etc.)
+        return self.view.finalize_response(self.view.request, response).render()
+
+    def render(self, data, status=200):
+        return self.respond(Response(data, status=status))
+
+class AsyncValuesListView(AsyncReadView):
+    async def get(self, request):
+        view = self.view
+        serializer = view.get_serializer()
+        columns = serializer.get_values_columns()
+        if columns is None:
+            return await self.fallback()
+        page = await view.paginator.apaginate_queryset(view.get_values_queryset(columns), view.request, view=view)
+        return self.render(view.paginator.get_paginated_data(serializer.values_representation(page)))
+
+class AsyncProductListView(AsyncValuesListView):
+    sync_view_class = ProductListCreateView
+
+class AsyncCategoryListView(AsyncValuesListView):
+    sync_view_class = CategoryListCreateView
+
+class AsyncProductDetailView(AsyncReadView):
+    sync_view_class = ProductDetailView
+
+    async def get(self, request, pk):
+        view = self.view
+        serializer = view.get_serializer()
+        columns = serializer.get_values_columns()
+        if columns is None:
+            return await self.fallback(pk=pk)
+        row = await view.get_queryset().values(*columns).filter(pk=pk).afirst()
+        if row is None:
+            raise NotFound(f'No {Product._meta.object_name} matches the given query.')
+        return self.render(serializer.values_representation([row])[0])
+
+class AsyncSalesAnalyticsView(AsyncReadView):
+    sync_view_class = SalesAnalyticsView
+    replica_reads = True
+
+    async def get(self, request):
+        queries = SalesAnalyticsView.get_queries()
+        return self.render(SalesAnalyticsView.build(*await parallel.afan_out(queries)))